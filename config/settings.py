@@ -82,6 +82,9 @@ METRICS_DIR = OUTPUT_DIR / "metrics"
 REPORTS_DIR = OUTPUT_DIR / "reports"
 PROCESSED_DIR = OUTPUT_DIR / "processed"
 
+# Backup local systématique des métriques (sinon uniquement si l'export en base échoue)
+LOCAL_BACKUP = os.getenv("LOCAL_BACKUP", "false").lower() in ("1", "true", "yes")
+
 # Création des répertoires output si nécessaire (uniquement en local)
 if not os.getenv("AWS_EXECUTION_ENV"):  # Pas dans Lambda
     for directory in [OUTPUT_DIR, METRICS_DIR, REPORTS_DIR, PROCESSED_DIR]:
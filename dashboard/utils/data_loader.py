@@ -77,21 +77,39 @@ def load_report(date: str, source: str) -> Optional[Dict[str, Any]]:
 
 
 def load_from_json(metric_type: str, date: str) -> Optional[Dict[str, Any]]:
-    """Charge depuis fichiers JSON locaux"""
+    """
+    Charge depuis fichiers locaux
+    
+    Priorité au backup complet JSONL ({type}_metrics_{date}.jsonl, écrit par
+    le pipeline), puis au fichier JSON ({type}_metrics_{date}.json).
+    """
     try:
         # Construire le chemin du fichier
         project_root = Path(__file__).parent.parent.parent
-        file_path = project_root / "output" / "metrics" / f"{metric_type}_metrics_{date}.json"
+        metrics_dir = project_root / "output" / "metrics"
+        jsonl_path = metrics_dir / f"{metric_type}_metrics_{date}.jsonl"
+        file_path = metrics_dir / f"{metric_type}_metrics_{date}.json"
+        
+        if jsonl_path.exists():
+            from processors.utils.file_utils import load_section_records
+            data = load_section_records(str(jsonl_path))
+            if data is not None:
+                print(f"✅ Chargé {metric_type} depuis JSONL: {list(data.keys())[:5]}")
+                return data
         
         if not file_path.exists():
-            print(f"❌ Fichier non trouvé: {file_path}")
-            return None
+            # Pas de backup local : métriques stockées uniquement en base
+            # (le pipeline n'écrit le backup que si nécessaire)
+            print(f"⚠ Fichier non trouvé: {file_path}, lecture depuis la base")
+            return load_from_database(metric_type, date)
         
         with open(file_path, 'r', encoding='utf-8') as f:
             data = json.load(f)
         
-        # Les fichiers JSON contiennent directement les indicators
-        # Pas besoin de transformation supplémentaire
+        # Fichier écrit par LocalFileService : indicateurs sous "metrics"
+        if isinstance(data, dict) and "metric_type" in data and "metrics" in data:
+            data = data["metrics"]
+        
         print(f"✅ Chargé {metric_type} depuis JSON: {list(data.keys())[:5]}")
         return data
     except Exception as e:
@@ -101,6 +119,24 @@ def load_from_json(metric_type: str, date: str) -> Optional[Dict[str, Any]]:
         return None
 
 
+def load_from_database(metric_type: str, date: str) -> Optional[Dict[str, Any]]:
+    """Charge depuis la base configurée (MongoDB ou fichiers locaux)"""
+    try:
+        from utils.database_factory import get_database_service
+        
+        db_service = get_database_service()
+        data = db_service.load_metrics(metric_type, date)
+        if hasattr(db_service, 'close'):
+            db_service.close()
+        
+        if data is None:
+            print(f"❌ Métriques {metric_type} non trouvées pour {date}")
+        return data
+    except Exception as e:
+        print(f"❌ Erreur base de données pour {metric_type}: {e}")
+        return None
+
+
 def load_from_mongodb(metric_type: str, date: str) -> Optional[Dict[str, Any]]:
     """Charge depuis MongoDB"""
     try:
@@ -1,11 +1,17 @@
 """Processors module"""
-from .base_processor import BaseProcessor
-from .bikes_processor import BikesProcessor
-from .traffic_processor import TrafficProcessor
-from .weather_processor import WeatherProcessor
-from .comptages_processor import ComptagesProcessor
-from .chantiers_processor import ChantiersProcessor
-from .referentiel_processor import ReferentielProcessor
+import importlib
+
+# Import différé : chaque processeur (et ses dépendances) n'est chargé qu'au
+# premier accès, ce qui réduit le temps de démarrage (cold start Lambda)
+_LAZY_IMPORTS = {
+    'BaseProcessor': '.base_processor',
+    'BikesProcessor': '.bikes_processor',
+    'TrafficProcessor': '.traffic_processor',
+    'WeatherProcessor': '.weather_processor',
+    'ComptagesProcessor': '.comptages_processor',
+    'ChantiersProcessor': '.chantiers_processor',
+    'ReferentielProcessor': '.referentiel_processor'
+}
 
 __all__ = [
     'BaseProcessor',
@@ -17,3 +23,11 @@ __all__ = [
     'ReferentielProcessor'
 ]
 
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -432,14 +432,7 @@ class ComptagesProcessor(BaseProcessor):
             print(f"  → {len(chunks)} chunks créés")
             
             # Traiter chaque chunk
-            all_metrics = []
-            all_top_10 = []
-            all_top_zones = []
-            all_alertes = []
-            total_vehicules = 0.0
-            total_temps_perdu = 0.0
-            total_troncons = 0
-            total_chunks_treated = 0
+            chunk_indicators = []
             
             for i, chunk_path in enumerate(chunks):
                 print(f"  → Traitement chunk {i+1}/{len(chunks)}...")
@@ -447,145 +440,161 @@ class ComptagesProcessor(BaseProcessor):
                     chunk_data = load_csv(chunk_path)
                     cleaned = self.validate_and_clean(chunk_data)
                     aggregated = self.aggregate_daily(cleaned)
-                    indicators = self.calculate_indicators(aggregated)
-                    
-                    # Accumuler les résultats
-                    all_metrics.extend(indicators.get("metrics", []))
-                    all_top_10.extend(indicators.get("top_10_troncons", []))
-                    all_top_zones.extend(indicators.get("top_10_zones_congestionnees", []))
-                    all_alertes.extend(indicators.get("alertes_congestion", []))
-                    
-                    # Accumuler totaux globaux
-                    global_m = indicators.get("global_metrics", {})
-                    total_vehicules += global_m.get("total_vehicules_jour", 0.0)
-                    total_temps_perdu += global_m.get("temps_perdu_total_paris", 0.0)
-                    total_troncons += len(indicators.get("metrics", []))
-                    total_chunks_treated += 1
+                    chunk_indicators.append(self.calculate_indicators(aggregated))
                 except Exception as e:
                     print(f"    ⚠ Erreur traitement chunk {i+1}: {e}")
                     continue
             
-            print(f"  ✓ {total_chunks_treated}/{len(chunks)} chunks traités avec succès")
-            
-            # Ré-agréger tous les chunks
-            # Top 10 final tronçons (tous chunks confondus)
-            top_10_final = sorted(
-                all_top_10,
-                key=lambda x: x.get("debit_journalier_total", 0),
-                reverse=True
-            )[:10]
-            
-            # Top 10 final zones (tous chunks confondus)
-            top_10_zones_final = sorted(
-                all_top_zones,
-                key=lambda x: x.get("temps_perdu_total_minutes", 0),
-                reverse=True
-            )[:10]
-            
-            # S'assurer que toutes les zones congestionnées ont zone_fallback
-            for zone in top_10_zones_final:
-                if "zone_fallback" not in zone or not zone.get("zone_fallback"):
-                    arr = zone.get("arrondissement", "Unknown")
-                    if arr != "Unknown":
-                        zone["zone_fallback"] = f"Arrondissement {arr}"
-                    else:
-                        geo_point = zone.get("geo_point_2d")
-                        if geo_point:
-                            try:
-                                lat_str, lon_str = geo_point.split(", ")
-                                lon = float(lon_str)
-                                lat = float(lat_str)
-                                zone_detectee = get_zone_from_coordinates(lon, lat)
-                                if zone_detectee and zone_detectee != "Unknown":
-                                    zone["zone_fallback"] = zone_detectee
-                                else:
-                                    quadrant = get_quadrant_from_coordinates(lon, lat)
-                                    zone["zone_fallback"] = quadrant if quadrant else "Unknown"
-                            except Exception:
-                                zone["zone_fallback"] = "Unknown"
-                        else:
-                            zone["zone_fallback"] = "Unknown"
-            
-            # Analyse par zones géographiques (pour tous les chunks)
-            zones_grouped = group_by_zone(all_metrics)
-            zones_metrics = calculate_zone_metrics(zones_grouped)
-            top_zones_affluence_final = identify_high_traffic_zones(zones_metrics, top_n=10)
-            
-            # Filtrer et nettoyer les alertes (exclure débit = 0, s'assurer zone_fallback présent)
-            alertes_filtrees = []
-            for alerte in all_alertes:
-                # Exclure débit = 0
-                if alerte.get("debit_journalier_total", 0) <= 0:
-                    continue
-                
-                # S'assurer que zone_fallback est présent
-                if "zone_fallback" not in alerte:
-                    arr = alerte.get("arrondissement", "Unknown")
-                    if arr != "Unknown":
-                        alerte["zone_fallback"] = f"Arrondissement {arr}"
-                    else:
-                        geo_point = alerte.get("geo_point_2d")
-                        if geo_point:
-                            try:
-                                lat_str, lon_str = geo_point.split(", ")
-                                lon = float(lon_str)
-                                lat = float(lat_str)
-                                zone = get_zone_from_coordinates(lon, lat)
-                                if zone and zone != "Unknown":
-                                    alerte["zone_fallback"] = zone
-                                else:
-                                    quadrant = get_quadrant_from_coordinates(lon, lat)
-                                    alerte["zone_fallback"] = quadrant if quadrant else "Unknown"
-                            except Exception:
-                                alerte["zone_fallback"] = "Unknown"
-                        else:
-                            alerte["zone_fallback"] = "Unknown"
-                
-                alertes_filtrees.append(alerte)
-            
-            # Trier par temps perdu total
-            alertes_filtrees = sorted(
-                alertes_filtrees,
-                key=lambda x: x.get("temps_perdu_total_minutes", 0),
-                reverse=True
-            )
-            
-            # Métriques globales agrégées
-            moyenne_debit = total_vehicules / total_troncons if total_troncons > 0 else 0.0
-            nombre_satures = len([m for m in all_metrics if m.get("congestion_alerte", False)])
-            
-            # Calculer les vrais totaux depuis all_metrics
-            debit_total_reel = sum(m.get("debit_journalier_total", 0) for m in all_metrics)
-            taux_occupation_moyen = sum(m.get("taux_occupation_moyen", 0) for m in all_metrics) / len(all_metrics) if all_metrics else 0
-            temps_perdu_total_heures = sum(m.get("temps_perdu_total_minutes", 0) for m in all_metrics) / 60.0
-            
-            global_metrics = {
-                "date": "",  # Sera rempli par export_results
-                "nombre_troncons_actifs": len(set(m.get("identifiant_arc") for m in all_metrics if m.get("identifiant_arc"))),
-                "debit_journalier_total": debit_total_reel,
-                "taux_occupation_moyen": taux_occupation_moyen,
-                "nombre_troncons_satures": nombre_satures,
-                "taux_disponibilite_capteurs": 100.0,
-                "temps_perdu_total_heures": temps_perdu_total_heures,
-                "repartition_etat_trafic": {}  # À calculer si besoin
-            }
+            print(f"  ✓ {len(chunk_indicators)}/{len(chunks)} chunks traités avec succès")
             
             # Retourner structure compatible avec process()
             return {
                 "cleaned_data": None,  # Non disponible après chunks
                 "aggregated_data": None,
-                "indicators": {
-                    "metrics": all_metrics,
-                    "top_10_troncons": top_10_final,
-                    "top_10_zones_congestionnees": top_10_zones_final,
-                    "top_zones_affluence": top_zones_affluence_final,  # Analyse par zones (avec/sans arrondissement)
-                    "alertes_congestion": alertes_filtrees[:20],  # Limiter à 20 (filtrées et nettoyées)
-                    "global_metrics": global_metrics
-                },
+                "indicators": self.merge_indicators(chunk_indicators),
                 "success": True,
                 "errors": []
             }
         else:
             # Traitement normal
             return self.process(load_csv(file_path))
-
+    
+    def merge_indicators(self, indicators_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Ré-agrège les indicateurs calculés sur plusieurs chunks ou shards
+        
+        Args:
+            indicators_list: Indicateurs de chaque chunk (sortie de calculate_indicators)
+        
+        Returns:
+            Indicateurs combinés (même structure que calculate_indicators)
+        """
+        all_metrics = []
+        all_top_10 = []
+        all_top_zones = []
+        all_alertes = []
+        total_vehicules = 0.0
+        total_troncons = 0
+        
+        for indicators in indicators_list:
+            all_metrics.extend(indicators.get("metrics", []))
+            all_top_10.extend(indicators.get("top_10_troncons", []))
+            all_top_zones.extend(indicators.get("top_10_zones_congestionnees", []))
+            all_alertes.extend(indicators.get("alertes_congestion", []))
+            
+            # Accumuler totaux globaux
+            global_m = indicators.get("global_metrics", {})
+            total_vehicules += global_m.get("total_vehicules_jour", 0.0)
+            total_troncons += len(indicators.get("metrics", []))
+        
+        # Ré-agréger tous les chunks
+        # Top 10 final tronçons (tous chunks confondus)
+        top_10_final = sorted(
+            all_top_10,
+            key=lambda x: x.get("debit_journalier_total", 0),
+            reverse=True
+        )[:10]
+        
+        # Top 10 final zones (tous chunks confondus)
+        top_10_zones_final = sorted(
+            all_top_zones,
+            key=lambda x: x.get("temps_perdu_total_minutes", 0),
+            reverse=True
+        )[:10]
+        
+        # S'assurer que toutes les zones congestionnées ont zone_fallback
+        for zone in top_10_zones_final:
+            if "zone_fallback" not in zone or not zone.get("zone_fallback"):
+                arr = zone.get("arrondissement", "Unknown")
+                if arr != "Unknown":
+                    zone["zone_fallback"] = f"Arrondissement {arr}"
+                else:
+                    geo_point = zone.get("geo_point_2d")
+                    if geo_point:
+                        try:
+                            lat_str, lon_str = geo_point.split(", ")
+                            lon = float(lon_str)
+                            lat = float(lat_str)
+                            zone_detectee = get_zone_from_coordinates(lon, lat)
+                            if zone_detectee and zone_detectee != "Unknown":
+                                zone["zone_fallback"] = zone_detectee
+                            else:
+                                quadrant = get_quadrant_from_coordinates(lon, lat)
+                                zone["zone_fallback"] = quadrant if quadrant else "Unknown"
+                        except Exception:
+                            zone["zone_fallback"] = "Unknown"
+                    else:
+                        zone["zone_fallback"] = "Unknown"
+        
+        # Analyse par zones géographiques (pour tous les chunks)
+        zones_grouped = group_by_zone(all_metrics)
+        zones_metrics = calculate_zone_metrics(zones_grouped)
+        top_zones_affluence_final = identify_high_traffic_zones(zones_metrics, top_n=10)
+        
+        # Filtrer et nettoyer les alertes (exclure débit = 0, s'assurer zone_fallback présent)
+        alertes_filtrees = []
+        for alerte in all_alertes:
+            # Exclure débit = 0
+            if alerte.get("debit_journalier_total", 0) <= 0:
+                continue
+            
+            # S'assurer que zone_fallback est présent
+            if "zone_fallback" not in alerte:
+                arr = alerte.get("arrondissement", "Unknown")
+                if arr != "Unknown":
+                    alerte["zone_fallback"] = f"Arrondissement {arr}"
+                else:
+                    geo_point = alerte.get("geo_point_2d")
+                    if geo_point:
+                        try:
+                            lat_str, lon_str = geo_point.split(", ")
+                            lon = float(lon_str)
+                            lat = float(lat_str)
+                            zone = get_zone_from_coordinates(lon, lat)
+                            if zone and zone != "Unknown":
+                                alerte["zone_fallback"] = zone
+                            else:
+                                quadrant = get_quadrant_from_coordinates(lon, lat)
+                                alerte["zone_fallback"] = quadrant if quadrant else "Unknown"
+                        except Exception:
+                            alerte["zone_fallback"] = "Unknown"
+                    else:
+                        alerte["zone_fallback"] = "Unknown"
+            
+            alertes_filtrees.append(alerte)
+        
+        # Trier par temps perdu total
+        alertes_filtrees = sorted(
+            alertes_filtrees,
+            key=lambda x: x.get("temps_perdu_total_minutes", 0),
+            reverse=True
+        )
+        
+        # Métriques globales agrégées
+        moyenne_debit = total_vehicules / total_troncons if total_troncons > 0 else 0.0
+        nombre_satures = len([m for m in all_metrics if m.get("congestion_alerte", False)])
+        
+        # Calculer les vrais totaux depuis all_metrics
+        debit_total_reel = sum(m.get("debit_journalier_total", 0) for m in all_metrics)
+        taux_occupation_moyen = sum(m.get("taux_occupation_moyen", 0) for m in all_metrics) / len(all_metrics) if all_metrics else 0
+        temps_perdu_total_heures = sum(m.get("temps_perdu_total_minutes", 0) for m in all_metrics) / 60.0
+        
+        global_metrics = {
+            "date": "",  # Sera rempli par export_results
+            "nombre_troncons_actifs": len(set(m.get("identifiant_arc") for m in all_metrics if m.get("identifiant_arc"))),
+            "debit_journalier_total": debit_total_reel,
+            "taux_occupation_moyen": taux_occupation_moyen,
+            "nombre_troncons_satures": nombre_satures,
+            "taux_disponibilite_capteurs": 100.0,
+            "temps_perdu_total_heures": temps_perdu_total_heures,
+            "repartition_etat_trafic": {}  # À calculer si besoin
+        }
+        
+        return {
+            "metrics": all_metrics,
+            "top_10_troncons": top_10_final,
+            "top_10_zones_congestionnees": top_10_zones_final,
+            "top_zones_affluence": top_zones_affluence_final,  # Analyse par zones (avec/sans arrondissement)
+            "alertes_congestion": alertes_filtrees[:20],  # Limiter à 20 (filtrées et nettoyées)
+            "global_metrics": global_metrics
+        }
@@ -3,34 +3,33 @@ Point d'entrée principal - Orchestration complète du traitement des données C
 Exécuté dans AWS (Lambda/EC2) pour le preprocessing
 """
 
+import asyncio
+import itertools
+import json
+import logging
+import re
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
-# Ajouter le répertoire parent au PYTHONPATH
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Ajouter le répertoire parent au PYTHONPATH (une seule fois)
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
 
 # Imports configuration
 from config import settings
 
-# Imports processeurs
-from processors import (
-    BikesProcessor, TrafficProcessor, WeatherProcessor,
-    ComptagesProcessor, ChantiersProcessor, ReferentielProcessor
-)
-
 # Imports utilitaires (depuis processors/utils/)
 from processors.utils.file_utils import (
-    load_json, find_json_files, load_and_combine_json_files, find_csv_files
+    load_json, find_json_files, load_and_combine_json_files, find_csv_files, save_jsonl,
+    iter_section_records
 )
 
-# Import services base de données (MongoDB ou DynamoDB)
-import sys
-sys.path.insert(0, str(Path(__file__).parent.parent))
-from utils.database_factory import get_database_service, get_database_type
-from utils.metrics_optimizer import should_optimize_for_mongodb, optimize_metrics_for_storage
+log = logging.getLogger(__name__)
 
 
 def load_raw_data(config) -> Dict[str, Any]:
@@ -44,10 +43,93 @@ def load_raw_data(config) -> Dict[str, Any]:
     Returns:
         Dict avec toutes les données brutes par type
     """
-    print("📁 Chargement des données depuis fichiers locaux...")
+    log.info("📁 Chargement des données depuis fichiers locaux...")
     return load_raw_data_local(config)
 
 
+def _combine_or_single(files: List[str]) -> Optional[Dict]:
+    """
+    Charge un fichier JSON, ou combine plusieurs fichiers
+    
+    Args:
+        files: Chemins des fichiers JSON
+    
+    Returns:
+        Données chargées ou None
+    """
+    if len(files) > 1:
+        log.info("  → Combinaison de %d fichiers...", len(files))
+        return load_and_combine_json_files(files)
+    return load_json(files[0])
+
+
+def _reduce_disruptions(files: List[str]) -> Optional[Dict]:
+    """
+    Combine les perturbations traffic de plusieurs fichiers
+    
+    Accepte le format API brut ({"disruptions": [...]}) et le format
+    collecté ({"data": [{"disruptions": [...]}, ...]}).
+    
+    Args:
+        files: Chemins des fichiers JSON traffic
+    
+    Returns:
+        Dict {"disruptions": [...]} ou None si aucune perturbation
+    """
+    if len(files) > 1:
+        log.info("  → Combinaison de %d fichiers...", len(files))
+    
+    all_disruptions = []
+    for document in map(load_json, files):
+        if not document:
+            continue
+        if isinstance(document, list):
+            items = document
+        elif "data" in document:
+            data = document["data"]
+            items = data if isinstance(data, list) else [data]
+        else:
+            items = [document]
+        
+        for item in items:
+            disruptions = item.get("disruptions") if isinstance(item, dict) else None
+            if disruptions:
+                all_disruptions.extend(disruptions)
+    
+    return {"disruptions": all_disruptions} if all_disruptions else None
+
+
+# Catégorie d'un CSV batch d'après son nom ("geographique" = référentiel)
+_CSV_CATEGORY_RE = re.compile(r"(?P<cat>comptages|chantiers|referentiel|geographique)", re.IGNORECASE)
+
+
+def _categorize_csv_files(paths: List[str], anchored: bool = False) -> Dict[str, List[str]]:
+    """
+    Répartit des CSV par type de données en un seul parcours
+    
+    Args:
+        paths: Chemins locaux ou clés S3
+        anchored: Si True, le nom du fichier doit commencer par la catégorie
+                  (équivalent des patterns "comptages*.csv"), sinon recherche
+                  dans tout le chemin
+    
+    Returns:
+        Dict {comptages, chantiers, referentiel} -> liste des fichiers
+    """
+    buckets = {"comptages": [], "chantiers": [], "referentiel": []}
+    
+    for path in paths:
+        if anchored:
+            match = _CSV_CATEGORY_RE.match(os.path.basename(path))
+        else:
+            match = _CSV_CATEGORY_RE.search(path)
+        if match:
+            category = match.group("cat").lower()
+            buckets["referentiel" if category == "geographique" else category].append(path)
+    
+    return buckets
+
+
 def load_raw_data_local(config) -> Dict[str, Any]:
     """
     Charge les données depuis fichiers locaux
@@ -67,229 +149,425 @@ def load_raw_data_local(config) -> Dict[str, Any]:
         "referentiel": None
     }
     
-    # Charger données API (JSON)
+    # Charger données API (JSON) - TOUS les fichiers de chaque flux sont combinés
+    api_streams = (
+        ("bikes", config.BIKES_JSON_PATH, None),
+        ("traffic", config.TRAFFIC_JSON_PATH, _reduce_disruptions),
+        ("weather", config.WEATHER_JSON_PATH, None)
+    )
     try:
-        # Bikes - Charger TOUS les fichiers et les combiner
-        bikes_files = find_json_files(str(config.BIKES_JSON_PATH))
-        if bikes_files:
-            print(f"📁 Trouvé {len(bikes_files)} fichier(s) bikes")
-            if len(bikes_files) > 1:
-                print(f"  → Combinaison de {len(bikes_files)} fichiers...")
-                raw_data["bikes"] = load_and_combine_json_files(bikes_files)
-            else:
-                raw_data["bikes"] = load_json(bikes_files[0])
-        
-        # Traffic - Charger TOUS les fichiers et les combiner
-        traffic_files = find_json_files(str(config.TRAFFIC_JSON_PATH))
-        if traffic_files:
-            print(f"📁 Trouvé {len(traffic_files)} fichier(s) traffic")
-            if len(traffic_files) > 1:
-                print(f"  → Combinaison de {len(traffic_files)} fichiers...")
-                raw_data["traffic"] = load_and_combine_json_files(traffic_files)
-            else:
-                raw_data["traffic"] = load_json(traffic_files[0])
-        
-        # Weather - Charger TOUS les fichiers et les combiner
-        weather_files = find_json_files(str(config.WEATHER_JSON_PATH))
-        if weather_files:
-            print(f"📁 Trouvé {len(weather_files)} fichier(s) weather")
-            if len(weather_files) > 1:
-                print(f"  → Combinaison de {len(weather_files)} fichiers...")
-                raw_data["weather"] = load_and_combine_json_files(weather_files)
-            else:
-                raw_data["weather"] = load_json(weather_files[0])
+        for name, path, reducer in api_streams:
+            files = find_json_files(str(path))
+            if files:
+                log.debug("📁 Trouvé %d fichier(s) %s", len(files), name)
+                raw_data[name] = reducer(files) if reducer else _combine_or_single(files)
     except Exception as e:
-        print(f"Erreur chargement données API: {e}")
+        log.error("Erreur chargement données API: %s", e)
     
     # Charger données Batch (CSV)
     try:
-        # Comptages - Chercher tous les fichiers CSV dans le répertoire
-        comptages_dir = config.COMPTAGES_CSV.parent
-        comptages_files = find_csv_files(str(comptages_dir), "comptages*.csv")
-        if comptages_files:
-            print(f"📁 Trouvé {len(comptages_files)} fichier(s) comptages")
-            if len(comptages_files) > 1:
-                print(f"  ⚠ Plusieurs fichiers trouvés, utilisation du premier: {comptages_files[0]}")
-                print(f"  💡 Pour traiter plusieurs fichiers, utilisez le traitement par chunk")
-            raw_data["comptages"] = comptages_files[0]  # Utiliser le premier pour compatibilité
-        elif config.COMPTAGES_CSV.exists():
-            raw_data["comptages"] = str(config.COMPTAGES_CSV)
-        
-        # Chantiers - Chercher tous les fichiers CSV
-        chantiers_dir = config.CHANTIERS_CSV.parent
-        chantiers_files = find_csv_files(str(chantiers_dir), "chantiers*.csv")
-        if chantiers_files:
-            print(f"📁 Trouvé {len(chantiers_files)} fichier(s) chantiers")
-            if len(chantiers_files) > 1:
-                print(f"  ⚠ Plusieurs fichiers trouvés, utilisation du premier: {chantiers_files[0]}")
-            raw_data["chantiers"] = chantiers_files[0]
-        elif config.CHANTIERS_CSV.exists():
-            raw_data["chantiers"] = str(config.CHANTIERS_CSV)
+        # Un seul parcours par répertoire, puis répartition par type
+        csv_defaults = {
+            "comptages": config.COMPTAGES_CSV,
+            "chantiers": config.CHANTIERS_CSV,
+            "referentiel": config.REFERENTIEL_CSV
+        }
+        listings = {}
+        for default in csv_defaults.values():
+            directory = str(default.parent)
+            if directory not in listings:
+                listings[directory] = _categorize_csv_files(find_csv_files(directory), anchored=True)
         
-        # Référentiel - Chercher tous les fichiers CSV
-        referentiel_dir = config.REFERENTIEL_CSV.parent
-        referentiel_files = find_csv_files(str(referentiel_dir), "referentiel*.csv")
-        if referentiel_files:
-            print(f"📁 Trouvé {len(referentiel_files)} fichier(s) référentiel")
-            if len(referentiel_files) > 1:
-                print(f"  ⚠ Plusieurs fichiers trouvés, utilisation du premier: {referentiel_files[0]}")
-            raw_data["referentiel"] = referentiel_files[0]
-        elif config.REFERENTIEL_CSV.exists():
-            raw_data["referentiel"] = str(config.REFERENTIEL_CSV)
+        for data_type, default in csv_defaults.items():
+            files = listings[str(default.parent)][data_type]
+            if files:
+                log.debug("📁 Trouvé %d fichier(s) %s", len(files), data_type)
+                if len(files) > 1:
+                    log.warning("  ⚠ Plusieurs fichiers trouvés, utilisation du premier: %s", files[0])
+                    if data_type == "comptages":
+                        log.info("  💡 Pour traiter plusieurs fichiers, utilisez le traitement par chunk")
+                raw_data[data_type] = files[0]  # Utiliser le premier pour compatibilité
+            elif default.exists():
+                raw_data[data_type] = str(default)
     except Exception as e:
-        print(f"Erreur chargement données batch: {e}")
+        log.error("Erreur chargement données batch: %s", e)
     
     return raw_data
 
 
-def load_raw_data_from_s3(config) -> Dict[str, Any]:
+# Nombre maximum de requêtes S3 simultanées (évite les timeouts sur liens lents)
+S3_MAX_CONCURRENCY = 10
+
+# Préfixe des répertoires temporaires de shards comptages (supprimés après traitement)
+COMPTAGES_SHARD_DIR_PREFIX = "comptages_shards_"
+
+# Flux API S3 : (type, chemin ijson des enregistrements, clé du dict résultat)
+# Sans chemin, seul le premier fichier du flux est lu tel quel
+S3_API_STREAMS = (
+    ("bikes", "data.item", "data"),
+    ("traffic", "data.item.disruptions.item", "disruptions"),
+    ("weather", None, None)
+)
+
+
+def _download_csv_to_tempfile(s3_service, key: str) -> Optional[str]:
     """
-    Charge les données directement depuis S3
+    Télécharge un CSV S3 dans un fichier temporaire (streaming, GET par plages concurrents)
+    
+    Args:
+        s3_service: Service S3
+        key: Clé S3 du fichier CSV
+    
+    Returns:
+        Chemin du fichier temporaire ou None
+    """
+    import tempfile
+    
+    with tempfile.NamedTemporaryFile(suffix='.csv', delete=False) as tmp:
+        if s3_service.download_fileobj(key, tmp):
+            return tmp.name
+    
+    os.remove(tmp.name)
+    return None
+
+
+def _remove_comptages_shards(shard_paths: List[str]) -> None:
+    """
+    Supprime les répertoires temporaires des shards comptages téléchargés
+    
+    Args:
+        shard_paths: Chemins locaux des shards (retournés par _load_comptages_shards)
+    """
+    import shutil
+    
+    for shard_dir in {os.path.dirname(shard_path) for shard_path in shard_paths}:
+        if os.path.basename(shard_dir).startswith(COMPTAGES_SHARD_DIR_PREFIX):
+            shutil.rmtree(shard_dir, ignore_errors=True)
+
+
+def _load_comptages_shards(s3_service, key: str, shard_prefix: str) -> List[str]:
+    """
+    Récupère les shards (~128 MB) du CSV comptages
+    
+    Les shards déjà présents dans S3 (préfixe sharded/) ne sont réutilisés que
+    si leur manifeste correspond au CSV brut actuel (taille + ETag) et que
+    tous les shards listés se téléchargent. Sinon le CSV brut est lu en
+    streaming et redécoupé, les shards sont uploadés, puis le manifeste en
+    dernier (uniquement si tous les uploads ont réussi).
+    
+    Args:
+        s3_service: Service S3
+        key: Clé S3 du CSV comptages brut
+        shard_prefix: Préfixe S3 des shards
+    
+    Returns:
+        Liste des chemins locaux des shards (répertoire temporaire supprimé
+        par _remove_comptages_shards après traitement)
+    """
+    import tempfile
+    from utils.csv_sharder import shard_stream, get_manifest_name, build_manifest, manifest_matches
+    
+    shard_dir = tempfile.mkdtemp(prefix=COMPTAGES_SHARD_DIR_PREFIX)
+    source_id = s3_service.get_object_info(key)
+    manifest_key = f"{shard_prefix}{get_manifest_name(key)}"
+    
+    if source_id and s3_service.file_exists(manifest_key):
+        manifest = s3_service.read_json_from_s3(manifest_key)
+        if manifest_matches(manifest, source_id):
+            log.info("  → %d shards déjà présents dans S3", len(manifest["shards"]))
+            shard_paths = []
+            for name in manifest["shards"]:
+                local_path = os.path.join(shard_dir, name)
+                if not s3_service.download_file(f"{shard_prefix}{name}", local_path):
+                    log.warning("  ⚠ Shard %s non téléchargé, redécoupage du CSV", name)
+                    break
+                shard_paths.append(local_path)
+            else:
+                return shard_paths
+        else:
+            log.info("  → Manifeste des shards obsolète, redécoupage du CSV")
+    
+    # Découper le flux S3 directement (sans copie complète dans /tmp)
+    body = s3_service.open_stream(key)
+    if body is None:
+        return []
+    
+    try:
+        shard_paths = shard_stream(body, key, shard_dir, source_id=source_id)
+    finally:
+        body.close()
+    log.info("  → %d shards créés", len(shard_paths))
+    
+    if not source_id or not shard_paths:
+        return shard_paths
+    
+    # Uploader les shards, puis le manifeste en dernier si tout a réussi
+    names = [Path(shard_path).name for shard_path in shard_paths]
+    failed = [
+        name for shard_path, name in zip(shard_paths, names)
+        if not s3_service.upload_file(shard_path, f"{shard_prefix}{name}", content_type="text/csv")
+    ]
+    if failed:
+        log.warning("  ⚠ %d shard(s) non uploadé(s), manifeste non écrit (redécoupage au prochain run)",
+                    len(failed))
+    else:
+        manifest = json.dumps(build_manifest(source_id, names)).encode("utf-8")
+        if not s3_service.upload_bytes(manifest, manifest_key, content_type="application/json"):
+            log.warning("  ⚠ Manifeste des shards non uploadé: %s", manifest_key)
+    
+    return shard_paths
+
+
+async def _load_s3_async(config, raw_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Charge les données depuis S3 en parallélisant listages et téléchargements
+    
+    Les préfixes api/ et batch/ sont listés une seule fois, puis toutes les
+    lectures d'objets sont lancées en parallèle (limitées par un sémaphore).
+    Un groupe de lectures en échec (flux API, shards comptages, CSV)
+    n'empêche pas de garder les autres.
     
     Args:
         config: Configuration
+        raw_data: Dict rempli au fur et à mesure (conservé en cas d'erreur)
     
     Returns:
         Dict avec données par type
     """
-    import os
-    import tempfile
     from utils.aws_services import S3Service
     
-    raw_data = {}
-    
     # Configuration S3 EN DUR (plus besoin de .env)
     bucket_name = "bucket-cityflow-paris-s3-raw"
     prefix = "cityflow-raw/raw"
     
-    print(f"📦 S3 Bucket: {bucket_name}")
-    print(f"📦 S3 Prefix: {prefix}")
+    log.info("📦 S3 Bucket: %s", bucket_name)
+    log.info("📦 S3 Prefix: %s", prefix)
     
     s3_service = S3Service(bucket_name)
+    semaphore = asyncio.Semaphore(S3_MAX_CONCURRENCY)
+    
+    async def run_limited(func, *args):
+        async with semaphore:
+            return await asyncio.to_thread(func, *args)
+    
+    # Un seul listage par préfixe (au lieu d'un par type de données)
+    api_keys, batch_keys = await asyncio.gather(
+        asyncio.to_thread(s3_service.list_files_in_s3, f"{prefix}/api/"),
+        asyncio.to_thread(s3_service.list_files_in_s3, f"{prefix}/batch/", ".csv")
+    )
+    
+    def api_files(name: str) -> List[str]:
+        # JSONL en priorité, sinon JSON
+        folder = f"{prefix}/api/{name}/"
+        files = [k for k in api_keys if k.startswith(folder) and k.endswith(".jsonl")]
+        if not files:
+            files = [k for k in api_keys if k.startswith(folder) and k.endswith(".json")]
+        return files
+    
+    stream_files = {name: api_files(name) for name, _, _ in S3_API_STREAMS}
+    
+    # Les shards comptages (batch/sharded/) sont séparés des CSV bruts
+    shard_prefix = f"{prefix}/batch/sharded/"
+    batch_keys = [k for k in batch_keys if not k.startswith(shard_prefix)]
+    
+    csv_files = _categorize_csv_files(batch_keys)
+    comptages_files = csv_files["comptages"]
+    chantiers_files = csv_files["chantiers"]
+    referentiel_files = csv_files["referentiel"]
+    
+    for name, files in stream_files.items():
+        if files:
+            log.debug("📁 Trouvé %d fichier(s) %s dans S3", len(files), name)
+    if comptages_files:
+        log.debug("📁 Trouvé %d fichier(s) comptages dans S3 (%s)", len(comptages_files), comptages_files[0])
+        log.info("  → Téléchargement des shards (fichier volumineux)...")
+    if chantiers_files:
+        log.debug("📁 Trouvé %d fichier(s) chantiers dans S3", len(chantiers_files))
+    if referentiel_files:
+        log.debug("📁 Trouvé %d fichier(s) référentiel dans S3", len(referentiel_files))
+    
+    # Lancer toutes les lectures en parallèle
+    # Les CSV sont trop volumineux pour être chargés en mémoire, on les télécharge temporairement
+    csv_keys = {
+        "chantiers": chantiers_files[0] if chantiers_files else None,
+        "referentiel": referentiel_files[0] if referentiel_files else None
+    }
+    csv_types = [dt for dt, key in csv_keys.items() if key]
+    
+    async def load_stream(files: List[str], item_path: Optional[str]):
+        # Sans chemin : seul le premier fichier est lu tel quel
+        if item_path is None:
+            return await run_limited(s3_service.read_json_from_s3, files[0]) if files else None
+        # Sinon : lecture en streaming des seuls enregistrements utiles
+        parts = await asyncio.gather(*(run_limited(s3_service.read_json_items_from_s3, k, item_path)
+                                       for k in files))
+        return list(itertools.chain.from_iterable(parts))
+    
+    comptages_task = (
+        run_limited(_load_comptages_shards, s3_service, comptages_files[0], shard_prefix)
+        if comptages_files else asyncio.sleep(0, result=[])
+    )
+    
+    stream_results, comptages_shards, csv_paths = await asyncio.gather(
+        asyncio.gather(*(load_stream(stream_files[name], item_path)
+                         for name, item_path, _ in S3_API_STREAMS)),
+        comptages_task,
+        asyncio.gather(*(run_limited(_download_csv_to_tempfile, s3_service, csv_keys[dt])
+                         for dt in csv_types)),
+        return_exceptions=True
+    )
+    
+    # API - Combiner les enregistrements de chaque flux
+    if isinstance(stream_results, Exception):
+        log.warning("⚠ Erreur lecture flux API S3: %s", stream_results)
+    else:
+        for (name, _, result_key), loaded in zip(S3_API_STREAMS, stream_results):
+            if loaded:
+                raw_data[name] = {result_key: loaded} if result_key else loaded
+    
+    # Batch (CSV) - comptages sous forme de liste de shards
+    if isinstance(comptages_shards, Exception):
+        log.warning("⚠ Erreur chargement shards comptages S3: %s", comptages_shards)
+    elif comptages_shards:
+        raw_data["comptages"] = comptages_shards
+        log.info("  ✅ %d shards comptages prêts", len(comptages_shards))
+    
+    if isinstance(csv_paths, Exception):
+        log.warning("⚠ Erreur téléchargement CSV S3: %s", csv_paths)
+    else:
+        for data_type, tmp_path in zip(csv_types, csv_paths):
+            if tmp_path:
+                raw_data[data_type] = tmp_path
     
-    try:
-        # Charger données API (JSON/JSONL)
-        # Bikes
-        bikes_files = s3_service.list_files_in_s3(f"{prefix}/api/bikes/", ".jsonl")
-        if not bikes_files:
-            bikes_files = s3_service.list_files_in_s3(f"{prefix}/api/bikes/", ".json")
-        
-        if bikes_files:
-            print(f"📁 Trouvé {len(bikes_files)} fichier(s) bikes dans S3")
-            bikes_data = []
-            for file_key in bikes_files:
-                data = s3_service.read_json_from_s3(file_key)
-                if data:
-                    bikes_data.append(data)
-            
-            # Combiner toutes les données
-            if bikes_data:
-                combined = {"data": []}
-                for d in bikes_data:
-                    if "data" in d:
-                        if isinstance(d["data"], list):
-                            combined["data"].extend(d["data"])
-                        else:
-                            combined["data"].append(d["data"])
-                raw_data["bikes"] = combined
-        
-        # Traffic
-        traffic_files = s3_service.list_files_in_s3(f"{prefix}/api/traffic/", ".jsonl")
-        if not traffic_files:
-            traffic_files = s3_service.list_files_in_s3(f"{prefix}/api/traffic/", ".json")
-        
-        if traffic_files:
-            print(f"📁 Trouvé {len(traffic_files)} fichier(s) traffic dans S3")
-            # Combiner tous les fichiers traffic
-            all_disruptions = []
-            for file_key in traffic_files:
-                data = s3_service.read_json_from_s3(file_key)
-                if data and "data" in data:
-                    items = data["data"] if isinstance(data["data"], list) else [data["data"]]
-                    for item in items:
-                        if "disruptions" in item:
-                            all_disruptions.extend(item["disruptions"])
-            
-            if all_disruptions:
-                raw_data["traffic"] = {"disruptions": all_disruptions}
-        
-        # Weather
-        weather_files = s3_service.list_files_in_s3(f"{prefix}/api/weather/", ".jsonl")
-        if not weather_files:
-            weather_files = s3_service.list_files_in_s3(f"{prefix}/api/weather/", ".json")
-        
-        if weather_files:
-            print(f"📁 Trouvé {len(weather_files)} fichier(s) weather dans S3")
-            data = s3_service.read_json_from_s3(weather_files[0])
-            if data:
-                raw_data["weather"] = data
-        
-        # Charger données BATCH (CSV) - Téléchargement temporaire pour traitement
-        # Les CSV sont trop volumineux pour être chargés en mémoire, on les télécharge temporairement
-        
-        # Comptages
-        comptages_files = s3_service.list_files_in_s3(f"{prefix}/batch/", ".csv")
-        comptages_files = [f for f in comptages_files if "comptages" in f.lower()]
-        if comptages_files:
-            print(f"📁 Trouvé {len(comptages_files)} fichier(s) comptages dans S3 ({comptages_files[0]})")
-            print(f"  → Téléchargement temporaire (fichier volumineux)...")
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
-                content = s3_service.read_csv_from_s3(comptages_files[0])
-                if content:
-                    tmp.write(content)
-                    tmp.flush()
-                    raw_data["comptages"] = tmp.name
-                    print(f"  ✅ Fichier temporaire: {tmp.name}")
-        
-        # Chantiers
-        chantiers_files = s3_service.list_files_in_s3(f"{prefix}/batch/", ".csv")
-        chantiers_files = [f for f in chantiers_files if "chantiers" in f.lower()]
-        if chantiers_files:
-            print(f"📁 Trouvé {len(chantiers_files)} fichier(s) chantiers dans S3")
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
-                content = s3_service.read_csv_from_s3(chantiers_files[0])
-                if content:
-                    tmp.write(content)
-                    tmp.flush()
-                    raw_data["chantiers"] = tmp.name
-        
-        # Référentiel
-        referentiel_files = s3_service.list_files_in_s3(f"{prefix}/batch/", ".csv")
-        referentiel_files = [f for f in referentiel_files if "referentiel" in f.lower() or "geographique" in f.lower()]
-        if referentiel_files:
-            print(f"📁 Trouvé {len(referentiel_files)} fichier(s) référentiel dans S3")
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
-                content = s3_service.read_csv_from_s3(referentiel_files[0])
-                if content:
-                    tmp.write(content)
-                    tmp.flush()
-                    raw_data["referentiel"] = tmp.name
+    return raw_data
+
+
+def load_raw_data_from_s3(config) -> Dict[str, Any]:
+    """
+    Charge les données directement depuis S3
     
+    Args:
+        config: Configuration
+    
+    Returns:
+        Dict avec données par type (partiel en cas d'erreur)
+    """
+    raw_data = {}
+    try:
+        return asyncio.run(_load_s3_async(config, raw_data))
     except Exception as e:
-        print(f"⚠ Erreur chargement depuis S3: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("⚠ Erreur chargement depuis S3: %s", e)
+        return raw_data
+
+
+# Classe de processeur par type de données (importée au premier usage)
+PROCESSOR_CLASSES = {
+    "bikes": "BikesProcessor",
+    "traffic": "TrafficProcessor",
+    "weather": "WeatherProcessor",
+    "comptages": "ComptagesProcessor",
+    "chantiers": "ChantiersProcessor",
+    "referentiel": "ReferentielProcessor"
+}
+
+
+def _processor_class(data_type: str):
+    """
+    Importe et retourne la classe de processeur d'un type de données
     
-    return raw_data
+    Args:
+        data_type: Type de données
+    
+    Returns:
+        Classe du processeur
+    """
+    import processors as processors_module
+    return getattr(processors_module, PROCESSOR_CLASSES[data_type])
 
 
-def initialize_processors(config) -> Dict[str, Any]:
+def initialize_processors(config, data_types: Optional[List[str]] = None) -> Dict[str, Any]:
     """
-    Initialise tous les processeurs
+    Initialise les processeurs
+    
+    Seuls les types demandés sont importés et instanciés.
     
     Args:
         config: Configuration
+        data_types: Types à initialiser (défaut: tous)
     
     Returns:
         Dict des processeurs par type
     """
+    if data_types is None:
+        data_types = list(PROCESSOR_CLASSES)
+    
+    return {data_type: _processor_class(data_type)(config) for data_type in data_types}
+
+
+def _run_one(data_type: str, data: Any) -> Dict[str, Any]:
+    """
+    Traite un type de données (exécuté dans un processus enfant)
+    
+    Le processeur est recréé dans le processus enfant (la configuration est
+    un module, non sérialisable) plutôt que d'être transmis par pickle.
+    
+    Args:
+        data_type: Type de données
+        data: Données brutes
+    
+    Returns:
+        Résultat de traitement
+    """
+    processor = _processor_class(data_type)(settings)
+    
+    # Cas spécial pour comptages (shards ou gros fichier)
+    if data_type == "comptages" and isinstance(data, list):
+        return process_comptages_shards(processor, data)
+    if data_type == "comptages" and isinstance(data, str):
+        return processor.process_large_file(data)
+    return processor.process(data)
+
+
+def _process_comptages_shard(shard_path: str) -> Dict[str, Any]:
+    """
+    Traite un shard comptages (exécuté dans un processus enfant)
+    
+    Le processeur est recréé dans le processus enfant pour éviter de le sérialiser.
+    
+    Args:
+        shard_path: Chemin du shard CSV
+    
+    Returns:
+        Résultat de process_large_file
+    """
+    return _processor_class("comptages")(settings).process_large_file(shard_path)
+
+
+def process_comptages_shards(processor, shard_paths: List[str]) -> Dict[str, Any]:
+    """
+    Traite les shards comptages en parallèle puis fusionne les indicateurs
+    
+    Args:
+        processor: ComptagesProcessor utilisé pour la fusion
+        shard_paths: Chemins des shards CSV
+    
+    Returns:
+        Résultats agrégés (même structure que process())
+    """
+    max_workers = min(len(shard_paths), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        shard_results = list(executor.map(_process_comptages_shard, shard_paths))
+    
+    indicators_list = [r["indicators"] for r in shard_results if r.get("success") and r.get("indicators")]
+    errors = [err for r in shard_results for err in r.get("errors", [])]
+    log.info("    ✓ %d/%d shards traités", len(indicators_list), len(shard_paths))
+    
     return {
-        "bikes": BikesProcessor(config),
-        "traffic": TrafficProcessor(config),
-        "weather": WeatherProcessor(config),
-        "comptages": ComptagesProcessor(config),
-        "chantiers": ChantiersProcessor(config),
-        "referentiel": ReferentielProcessor(config)
+        "cleaned_data": None,
+        "aggregated_data": None,
+        "indicators": processor.merge_indicators(indicators_list),
+        "success": bool(indicators_list),
+        "errors": errors
     }
 
 
@@ -317,10 +595,30 @@ def enrich_multi_source(results: Dict, referentiel_data: Optional[Dict] = None)
     return results
 
 
+def _safe_unlink(path: str):
+    """
+    Supprime un fichier sans lever d'exception
+    
+    Args:
+        path: Chemin du fichier
+    
+    Returns:
+        True si supprimé, sinon l'exception rencontrée
+    """
+    try:
+        os.unlink(path)
+        return True
+    except OSError as e:
+        return e
+
+
 def cleanup_processed_chunks(config, keep_chunks=False):
     """
     Nettoie les fichiers chunks temporaires après traitement
     
+    Les suppressions sont parallélisées (coûteuses sur EFS/NFS où chaque
+    unlink est un aller-retour de métadonnées).
+    
     Args:
         config: Configuration
         keep_chunks: Si True, garde les chunks (pour debug)
@@ -328,22 +626,84 @@ def cleanup_processed_chunks(config, keep_chunks=False):
     if keep_chunks:
         return
     
-    import glob
-    import os
+    import fnmatch
     
-    chunk_files = glob.glob(str(config.PROCESSED_DIR / "*_chunk_*.csv"))
+    try:
+        with os.scandir(config.PROCESSED_DIR) as entries:
+            chunk_files = [
+                entry.path for entry in entries
+                if fnmatch.fnmatch(entry.name, "*_chunk_*.csv")
+            ]
+    except OSError:
+        return
     
     if chunk_files:
+        with ThreadPoolExecutor(max_workers=32) as executor:
+            results = list(zip(chunk_files, executor.map(_safe_unlink, chunk_files)))
+        
         deleted_count = 0
-        for chunk_file in chunk_files:
-            try:
-                os.remove(chunk_file)
+        for chunk_file, outcome in results:
+            if outcome is True:
                 deleted_count += 1
-            except Exception as e:
-                print(f"  ⚠ Erreur suppression {chunk_file}: {e}")
+            else:
+                log.warning("  ⚠ Erreur suppression %s: %s", chunk_file, outcome)
         
         if deleted_count > 0:
-            print(f"  ✓ {deleted_count} fichiers chunks nettoyés")
+            log.info("  ✓ %d fichiers chunks nettoyés", deleted_count)
+
+
+# Sections datées par type de données : (section, complétion zone_fallback)
+_ALL_DATED_SECTIONS = (
+    ("metrics", False),
+    ("top_10_troncons", False),
+    ("top_10_zones_congestionnees", True),
+    ("alertes_congestion", False)
+)
+_DATE_FILL_SCHEMA = {
+    "bikes": (("metrics", False),),
+    "comptages": _ALL_DATED_SECTIONS,
+    "traffic": (),
+    "weather": (),
+    "chantiers": (),
+    "referentiel": ()
+}
+
+
+def _apply_date(items: Any, date: str, needs_fallback: bool) -> None:
+    """
+    Remplit les dates vides d'une section d'indicateurs
+    
+    Args:
+        items: Éléments de la section (modifiés sur place)
+        date: Date au format YYYY-MM-DD
+        needs_fallback: Compléter aussi zone_fallback (zones congestionnées)
+    """
+    if not items or not isinstance(items, list):
+        return
+    
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        if item.get("date") == "":
+            item["date"] = date
+        
+        # S'assurer que zone_fallback est présent
+        if needs_fallback and not item.get("zone_fallback"):
+            arr = item.get("arrondissement", "Unknown")
+            item["zone_fallback"] = f"Arrondissement {arr}" if arr != "Unknown" else "Unknown"
+
+
+def _fill_dates(data_type: str, indicators: Dict, date: str) -> None:
+    """
+    Remplit les dates vides des indicateurs selon le schéma du type de données
+    
+    Args:
+        data_type: Type de données
+        indicators: Indicateurs (modifiés sur place)
+        date: Date au format YYYY-MM-DD
+    """
+    for section, needs_fallback in _DATE_FILL_SCHEMA.get(data_type, _ALL_DATED_SECTIONS):
+        _apply_date(indicators.get(section), date, needs_fallback)
 
 
 def export_results(results: Dict, config, date: Optional[str] = None) -> None:
@@ -362,93 +722,66 @@ def export_results(results: Dict, config, date: Optional[str] = None) -> None:
     # Remplir la date dans toutes les métriques
     for data_type, result in results.items():
         if result and result.get("indicators"):
-            indicators = result.get("indicators", {})
-            # Remplir date dans les métriques individuelles
-            if "metrics" in indicators and isinstance(indicators["metrics"], list):
-                for metric in indicators["metrics"]:
-                    # Vérifier que metric est bien un dict
-                    if isinstance(metric, dict) and "date" in metric and metric["date"] == "":
-                        metric["date"] = date
-            
-            # Remplir date dans les top 10 tronçons
-            if "top_10_troncons" in indicators:
-                for troncon in indicators["top_10_troncons"]:
-                    if "date" in troncon and troncon["date"] == "":
-                        troncon["date"] = date
-            
-            # Remplir date dans les top 10 zones congestionnées
-            if "top_10_zones_congestionnees" in indicators:
-                for zone in indicators["top_10_zones_congestionnees"]:
-                    if "date" in zone and zone["date"] == "":
-                        zone["date"] = date
-                    # S'assurer que zone_fallback est présent
-                    if "zone_fallback" not in zone or not zone.get("zone_fallback"):
-                        arr = zone.get("arrondissement", "Unknown")
-                        if arr != "Unknown":
-                            zone["zone_fallback"] = f"Arrondissement {arr}"
-                        else:
-                            zone["zone_fallback"] = "Unknown"
-            
-            # Remplir date dans les alertes de congestion
-            if "alertes_congestion" in indicators:
-                for alerte in indicators["alertes_congestion"]:
-                    if "date" in alerte and alerte["date"] == "":
-                        alerte["date"] = date
+            _fill_dates(data_type, result["indicators"], date)
+    
+    from utils.database_factory import get_database_service, get_database_type
+    from utils.metrics_optimizer import should_optimize_for_mongodb, optimize_metrics_for_storage
     
     # Obtenir le service de base de données (MongoDB ou DynamoDB selon config)
     try:
         db_service = get_database_service()
         db_type = get_database_type()
     except Exception as e:
-        print(f"\n✗ Erreur initialisation base de données: {e}")
-        print("💡 Les métriques seront sauvegardées en local uniquement")
+        log.error("\n✗ Erreur initialisation base de données: %s", e)
+        log.info("💡 Les métriques seront sauvegardées en local uniquement")
         db_service = None
         db_type = "local"
     
-    # Exporter métriques par type
+    # Préparer les métriques par type (écriture groupée en base ensuite)
     exported_count = 0
+    to_export = {}  # data_type -> indicateurs complets
+    pending = []  # (data_type, metrics, optimisé)
     for data_type, result in results.items():
         if result and result.get("success"):
             indicators = result.get("indicators", {})
             if indicators:
-                # Vérifier si optimisation nécessaire pour MongoDB
-                if db_service and should_optimize_for_mongodb(data_type, indicators):
-                    # Créer version optimisée pour MongoDB (sans liste complète des tronçons)
-                    optimized_indicators = optimize_metrics_for_storage(data_type, indicators)
-                    print(f"  ⚠ Métriques {data_type} optimisées pour stockage (taille réduite)")
-                    print(f"     → Version complète disponible en fichier local uniquement")
-                    
-                    # Sauvegarder version optimisée dans la base de données
-                    success = db_service.save_metrics(
-                        metrics=optimized_indicators,
-                        data_type=data_type,
-                        date=date
-                    )
-                    if success:
-                        exported_count += 1
-                        print(f"✓ Métriques {data_type} (summary) exportées vers {db_type.upper()}")
+                to_export[data_type] = indicators
+                if db_service:
+                    # Vérifier si optimisation nécessaire pour MongoDB
+                    if should_optimize_for_mongodb(data_type, indicators):
+                        # Créer version optimisée pour MongoDB (sans liste complète des tronçons)
+                        optimized_indicators = optimize_metrics_for_storage(data_type, indicators)
+                        log.warning("  ⚠ Métriques %s optimisées pour stockage (taille réduite)", data_type)
+                        log.info("     → Version complète disponible en fichier local uniquement")
+                        pending.append((data_type, optimized_indicators, True))
                     else:
-                        print(f"✗ Erreur export métriques {data_type} vers {db_type.upper()}")
-                else:
-                    # Sauvegarder version complète dans la base de données
-                    if db_service:
-                        success = db_service.save_metrics(
-                            metrics=indicators,
-                            data_type=data_type,
-                            date=date
-                        )
-                        if success:
-                            exported_count += 1
-                            print(f"✓ Métriques {data_type} exportées vers {db_type.upper()}")
-                        else:
-                            print(f"✗ Erreur export métriques {data_type} vers {db_type.upper()}")
-                
-                # Toujours sauvegarder version complète en local (backup + référence)
-                if not os.getenv("AWS_EXECUTION_ENV"):
-                    from processors.utils.file_utils import save_json
-                    output_path = config.METRICS_DIR / f"{data_type}_metrics_{date}.json"
-                    save_json(indicators, str(output_path))
-                    print(f"  → Sauvegarde locale (backup complet): {output_path}")
+                        pending.append((data_type, indicators, False))
+    
+    # Sauvegarder toutes les métriques en un seul appel
+    stored = set()  # types dont la version complète est en base
+    if db_service and pending:
+        statuses = db_service.save_metrics_bulk(
+            [(data_type, date, metrics) for data_type, metrics, _ in pending]
+        )
+        for (data_type, _, optimized), success in zip(pending, statuses):
+            label = " (summary)" if optimized else ""
+            if success:
+                exported_count += 1
+                if not optimized:
+                    stored.add(data_type)
+                log.info("✓ Métriques %s%s exportées vers %s", data_type, label, db_type.upper())
+            else:
+                log.error("✗ Erreur export métriques %s vers %s", data_type, db_type.upper())
+    
+    # Backup local de la version complète : si demandé (LOCAL_BACKUP),
+    # ou si elle n'a pas pu être stockée en base (échec, version optimisée, pas de base)
+    if not os.getenv("AWS_EXECUTION_ENV"):
+        local_backup = getattr(config, "LOCAL_BACKUP", False)
+        for data_type, indicators in to_export.items():
+            if local_backup or data_type not in stored:
+                output_path = config.METRICS_DIR / f"{data_type}_metrics_{date}.jsonl"
+                save_jsonl(iter_section_records(indicators), str(output_path))
+                log.info("  → Sauvegarde locale (backup complet): %s", output_path)
     
     # Fermer connexion MongoDB si applicable
     if db_service and hasattr(db_service, 'close'):
@@ -457,9 +790,9 @@ def export_results(results: Dict, config, date: Optional[str] = None) -> None:
     # Nettoyer chunks temporaires après export réussi
     cleanup_processed_chunks(config, keep_chunks=False)
     
-    print(f"\n✓ {exported_count} types de métriques exportés vers {db_type.upper()}")
-    print("\n💡 Pour générer le rapport quotidien (instance séparée), exécutez:")
-    print(f"   python report_generator/main.py {date}")
+    log.info("\n✓ %d types de métriques exportés vers %s", exported_count, db_type.upper())
+    log.info("\n💡 Pour générer le rapport quotidien (instance séparée), exécutez:")
+    log.info("   python report_generator/main.py %s", date)
 
 
 def main(date: Optional[str] = None):
@@ -469,6 +802,13 @@ def main(date: Optional[str] = None):
     Args:
         date: Date au format YYYY-MM-DD (défaut: aujourd'hui)
     """
+    # Logs sur stderr ; les lignes par fichier sont en DEBUG (LOG_LEVEL=DEBUG pour les voir)
+    logging.basicConfig(
+        level=getattr(logging, str(settings.LOG_LEVEL).upper(), logging.INFO),
+        format="%(message)s",
+        stream=sys.stderr,
+    )
+    
     # Déterminer la date de traitement
     if date is None:
         date = datetime.now().strftime("%Y-%m-%d")
@@ -477,92 +817,101 @@ def main(date: Optional[str] = None):
         try:
             datetime.strptime(date, "%Y-%m-%d")
         except ValueError:
-            print(f"⚠ Format de date invalide: {date}, utilisation de la date d'aujourd'hui")
+            log.warning("⚠ Format de date invalide: %s, utilisation de la date d'aujourd'hui", date)
             date = datetime.now().strftime("%Y-%m-%d")
     
-    print("=" * 60)
-    print("CityFlow Analytics - Traitement des Données")
-    print(f"Date: {date}")
-    print("=" * 60)
+    log.info("=" * 60)
+    log.info("CityFlow Analytics - Traitement des Données")
+    log.info("Date: %s", date)
+    log.info("=" * 60)
     
     try:
         # 1. Chargement configuration
-        print("\n[1/6] Chargement configuration...")
+        log.info("\n[1/6] Chargement configuration...")
         config = settings
-        print("✓ Configuration chargée")
+        log.info("✓ Configuration chargée")
         
-        # 2. Initialisation processeurs
-        print("\n[2/6] Initialisation processeurs...")
-        processors = initialize_processors(config)
-        print(f"✓ {len(processors)} processeurs initialisés")
-        
-        # 3. Chargement données brutes
-        print("\n[3/6] Chargement données brutes...")
+        # 2. Chargement données brutes
+        log.info("\n[2/6] Chargement données brutes...")
         raw_data = load_raw_data(config)
         
         data_loaded = sum(1 for v in raw_data.values() if v is not None)
-        print(f"✓ {data_loaded} sources de données chargées")
+        log.info("✓ %d sources de données chargées", data_loaded)
+        
+        # 3. Initialisation processeurs : seul le référentiel est traité dans ce
+        # processus, les autres types sont instanciés dans les processus enfants (_run_one)
+        log.info("\n[3/6] Initialisation processeurs...")
+        processors = initialize_processors(
+            config, ["referentiel"] if raw_data.get("referentiel") is not None else []
+        )
+        log.info("✓ %d processeurs initialisés", len(processors))
         
         # 4. Traitement par type de données
-        print("\n[4/6] Traitement des données...")
+        log.info("\n[4/6] Traitement des données...")
         results = {}
         
         # Traiter référentiel en premier (pour enrichissement)
         if raw_data.get("referentiel"):
-            print("  → Traitement référentiel géographique...")
+            log.info("  → Traitement référentiel géographique...")
             results["referentiel"] = processors["referentiel"].process(raw_data["referentiel"])
         
-        # Traiter autres données
-        for data_type, processor in processors.items():
+        # Traiter autres données en parallèle (aucun état partagé entre types)
+        pending = {}
+        for data_type in PROCESSOR_CLASSES:
             if data_type == "referentiel":
                 continue  # Déjà traité
             
             data = raw_data.get(data_type)
             if data is None:
-                print(f"  ⚠ Pas de données pour {data_type}")
+                log.warning("  ⚠ Pas de données pour %s", data_type)
                 continue
-            
-            print(f"  → Traitement {data_type}...")
-            
-            try:
-                # Cas spécial pour comptages (gros fichier)
-                if data_type == "comptages" and isinstance(data, str):
-                    result = processors[data_type].process_large_file(data)
-                else:
-                    result = processor.process(data)
+            pending[data_type] = data
+        
+        if pending:
+            max_workers = min(len(pending), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = {}
+                for data_type, data in pending.items():
+                    log.info("  → Traitement %s...", data_type)
+                    futures[data_type] = executor.submit(_run_one, data_type, data)
                 
-                results[data_type] = result
-                print(f"    ✓ {data_type} traité avec succès")
-            except Exception as e:
-                print(f"    ✗ Erreur traitement {data_type}: {e}")
-                results[data_type] = {"success": False, "errors": [str(e)]}
+                for data_type, future in futures.items():
+                    try:
+                        results[data_type] = future.result()
+                        log.info("    ✓ %s traité avec succès", data_type)
+                    except Exception as e:
+                        log.error("    ✗ Erreur traitement %s: %s", data_type, e)
+                        results[data_type] = {"success": False, "errors": [str(e)]}
+        
+        # Les shards comptages téléchargés depuis S3 ne servent plus
+        if isinstance(raw_data.get("comptages"), list):
+            _remove_comptages_shards(raw_data["comptages"])
         
         # 5. Enrichissement multi-sources
-        print("\n[5/6] Enrichissement multi-sources...")
+        log.info("\n[5/6] Enrichissement multi-sources...")
         referentiel_data = results.get("referentiel")
         results = enrich_multi_source(results, referentiel_data)
-        print("✓ Enrichissement terminé")
+        log.info("✓ Enrichissement terminé")
         
         # 6. Export résultats (métriques uniquement)
-        print("\n[6/6] Export des métriques...")
+        log.info("\n[6/6] Export des métriques...")
         export_results(results, config, date=date)
-        print("✓ Export terminé")
+        log.info("✓ Export terminé")
         
-        print("\n" + "=" * 60)
-        print("Traitement terminé avec succès!")
-        print("=" * 60)
+        log.info("\n" + "=" * 60)
+        log.info("Traitement terminé avec succès!")
+        log.info("=" * 60)
+        from utils.database_factory import get_database_type
         db_type = get_database_type()
-        print(f"\n📊 Métriques exportées dans {db_type.upper()}")
-        print("📋 Pour générer le rapport (instance séparée), exécutez:")
-        print("   python report_generator/main.py")
-        print("=" * 60)
+        log.info("\n📊 Métriques exportées dans %s", db_type.upper())
+        log.info("📋 Pour générer le rapport (instance séparée), exécutez:")
+        log.info("   python report_generator/main.py")
+        log.info("=" * 60)
         
         return results
     
     except Exception as e:
-        print(f"\n✗ ERREUR FATALE: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("\n✗ ERREUR FATALE: %s", e)
         return None
 
 
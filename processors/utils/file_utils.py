@@ -5,10 +5,17 @@ Utilitaires pour la manipulation de fichiers : CSV, JSON, chunks
 import csv
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Iterator
+from typing import List, Dict, Any, Optional, Iterable, Iterator
 import sys
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Importer config depuis le répertoire parent
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import CHUNK_SIZE, PROCESSED_DIR
@@ -103,6 +110,9 @@ def load_json(file_path: str) -> Optional[Dict]:
         Dict des données ou None
     """
     try:
+        if ORJSON_AVAILABLE:
+            with open(file_path, 'rb') as f:
+                return orjson.loads(f.read())
         with open(file_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     except Exception as e:
@@ -110,7 +120,8 @@ def load_json(file_path: str) -> Optional[Dict]:
         return None
 
 
-def load_and_combine_json_files(file_paths: List[str]) -> Optional[Dict]:
+def load_and_combine_json_files(file_paths: List[str],
+                                max_workers: Optional[int] = None) -> Optional[Dict]:
     """
     Charge et combine plusieurs fichiers JSON en un seul dict
     
@@ -119,8 +130,12 @@ def load_and_combine_json_files(file_paths: List[str]) -> Optional[Dict]:
     - Si liste : concatène toutes les listes
     - Si dict : merge les dicts (les clés du dernier fichier écrase les précédentes)
     
+    Les fichiers sont lus en parallèle (le GIL est relâché pendant les lectures
+    disque), puis combinés dans l'ordre de file_paths.
+    
     Args:
         file_paths: Liste des chemins des fichiers JSON
+        max_workers: Nombre de threads de lecture (défaut: selon nombre de CPU)
     
     Returns:
         Dict ou List combiné, ou None si erreur
@@ -131,8 +146,13 @@ def load_and_combine_json_files(file_paths: List[str]) -> Optional[Dict]:
     all_data = []
     combined_dict = {}
     
-    for file_path in file_paths:
-        data = load_json(file_path)
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        documents = list(executor.map(load_json, file_paths))
+    
+    for data in documents:
         if data is None:
             continue
         
@@ -179,6 +199,15 @@ def save_json(data: Any,
         # Créer répertoire si nécessaire
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         
+        if ORJSON_AVAILABLE:
+            # orjson ne supporte que l'indentation à 2 espaces
+            option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+            if indent:
+                option |= orjson.OPT_INDENT_2
+            with open(file_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+            return True
+        
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=indent, ensure_ascii=False)
         
@@ -189,6 +218,97 @@ def save_json(data: Any,
         return False
 
 
+def save_jsonl(records: Iterable[Any],
+               file_path: str,
+               append: bool = False) -> bool:
+    """
+    Sauvegarde des enregistrements en JSON Lines (un objet JSON par ligne)
+    
+    Chaque ligne est écrite dès qu'elle est sérialisée : un lecteur peut
+    consommer le fichier ligne par ligne, et un arrêt brutal conserve les
+    lignes déjà écrites.
+    
+    Args:
+        records: Enregistrements à sauvegarder
+        file_path: Chemin de sortie
+        append: Ajouter à la fin du fichier au lieu de l'écraser
+    
+    Returns:
+        True si succès
+    """
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        
+        with open(file_path, 'ab' if append else 'wb') as f:
+            for record in records:
+                if ORJSON_AVAILABLE:
+                    f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS))
+                else:
+                    f.write(json.dumps(record, ensure_ascii=False, default=str).encode('utf-8') + b"\n")
+        
+        return True
+    
+    except Exception as e:
+        print(f"Erreur sauvegarde JSONL {file_path}: {e}")
+        return False
+
+
+def iter_section_records(indicators: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Sérialise des indicateurs en enregistrements JSONL par section
+    
+    Chaque section liste est précédée d'une ligne {"__section": nom} suivie
+    d'une ligne par élément ; les autres sections tiennent sur une ligne
+    {"__section": nom, "value": ...}. Inverse : load_section_records.
+    
+    Args:
+        indicators: Indicateurs d'un type de données
+    
+    Yields:
+        Enregistrements à écrire (un par ligne)
+    """
+    for section, value in indicators.items():
+        if isinstance(value, list):
+            yield {"__section": section}
+            yield from value
+        else:
+            yield {"__section": section, "value": value}
+
+
+def load_section_records(file_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Recharge des indicateurs écrits par save_jsonl(iter_section_records(...))
+    
+    Args:
+        file_path: Chemin du fichier JSONL
+    
+    Returns:
+        Dict des indicateurs ou None si erreur
+    """
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    indicators = {}
+    current = None  # liste de la section en cours
+    try:
+        with open(file_path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = loads(line)
+                if isinstance(record, dict) and "__section" in record:
+                    section = record["__section"]
+                    if "value" in record:
+                        indicators[section] = record["value"]
+                        current = None
+                    else:
+                        current = indicators[section] = []
+                elif current is not None:
+                    current.append(record)
+        return indicators
+    except Exception as e:
+        print(f"Erreur chargement JSONL {file_path}: {e}")
+        return None
+
+
 def chunk_file(file_path: str,
               chunk_size: int = None,
               output_dir: Optional[str] = None) -> List[str]:
@@ -251,9 +251,8 @@ class DailyReportGenerator:
         date = report.date
         report_dict = report.to_dict()
         
-        # Générer le contenu CSV
+        # Générer les lignes CSV
         csv_rows = report.to_csv_rows()
-        csv_content = "\n".join([";".join([str(cell) for cell in row[:2]]) for row in csv_rows])
         
         results = {}
         is_aws = os.getenv("AWS_EXECUTION_ENV") is not None
@@ -264,6 +263,10 @@ class DailyReportGenerator:
         if is_aws or os.getenv("USE_S3", "false").lower() == "true":
             # ☁️ AWS : Export CSV vers S3
             print("\n[Export CSV] → S3 Bucket")
+            # Contenu encodé une seule fois, envoyé tel quel à S3
+            csv_content = "\n".join(
+                ";".join(str(cell) for cell in row[:2]) for row in csv_rows
+            ).encode("utf-8")
             success = save_report_to_s3_csv(
                 csv_content=csv_content,
                 date=date,
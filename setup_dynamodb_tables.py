@@ -6,21 +6,42 @@ Usage: python3 setup_dynamodb_tables.py
 
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 try:
     import boto3
+    from botocore.config import Config
     from botocore.exceptions import ClientError
 except ImportError:
     print("❌ boto3 non installé. Installez-le avec: pip install boto3")
     sys.exit(1)
 
 
+def wait_table_active(dynamodb, table_name):
+    """
+    Attend que la table soit ACTIVE (polling toutes les secondes au lieu de 20 s)
+    
+    Args:
+        dynamodb: Ressource DynamoDB
+        table_name: Nom de la table
+    
+    Returns:
+        Durée d'attente en secondes
+    """
+    t0 = time.monotonic()
+    dynamodb.meta.client.get_waiter('table_exists').wait(
+        TableName=table_name,
+        WaiterConfig={'Delay': 1, 'MaxAttempts': 60}
+    )
+    return time.monotonic() - t0
+
+
 def create_table(dynamodb, table_name, partition_key, sort_key, region):
     """
     Crée une table DynamoDB
     
     Args:
-        dynamodb: Client DynamoDB
+        dynamodb: Ressource DynamoDB (propre au thread appelant)
         table_name: Nom de la table
         partition_key: Nom de la partition key
         sort_key: Nom de la sort key
@@ -57,14 +78,22 @@ def create_table(dynamodb, table_name, partition_key, sort_key, region):
         
         # Attendre que la table soit créée
         print(f"  ⏳ Création de la table {table_name} en cours...")
-        table.wait_until_exists()
-        print(f"  ✅ Table {table_name} créée avec succès")
+        elapsed = wait_table_active(dynamodb, table_name)
+        print(f"  ✅ Table {table_name} créée avec succès ({elapsed:.1f}s)")
+        print(f"     - Partition Key: {table.key_schema[0]['AttributeName']}")
+        print(f"     - Sort Key: {table.key_schema[1]['AttributeName']}")
         return True
     
     except ClientError as e:
         error_code = e.response['Error']['Code']
         if error_code == 'ResourceInUseException':
-            print(f"  ℹ️  Table {table_name} existe déjà")
+            # La table peut encore être en CREATING (run précédent ou concurrent)
+            print(f"  ℹ️  Table {table_name} existe déjà, attente du statut ACTIVE...")
+            try:
+                wait_table_active(dynamodb, table_name)
+            except Exception as wait_error:
+                print(f"  ❌ Table {table_name} non ACTIVE: {wait_error}")
+                return False
             return True
         else:
             print(f"  ❌ Erreur création {table_name}: {e}")
@@ -74,42 +103,6 @@ def create_table(dynamodb, table_name, partition_key, sort_key, region):
         return False
 
 
-def verify_table(dynamodb, table_name):
-    """
-    Vérifie qu'une table existe et est active
-    
-    Args:
-        dynamodb: Client DynamoDB
-        table_name: Nom de la table
-    
-    Returns:
-        True si la table existe et est active
-    """
-    try:
-        table = dynamodb.Table(table_name)
-        table.load()
-        
-        status = table.table_status
-        if status == 'ACTIVE':
-            print(f"  ✅ Table {table_name} : ACTIVE")
-            print(f"     - Partition Key: {table.key_schema[0]['AttributeName']}")
-            print(f"     - Sort Key: {table.key_schema[1]['AttributeName']}")
-            print(f"     - Item Count: {table.item_count}")
-            return True
-        else:
-            print(f"  ⚠️  Table {table_name} : {status}")
-            return False
-    
-    except ClientError as e:
-        error_code = e.response['Error']['Code']
-        if error_code == 'ResourceNotFoundException':
-            print(f"  ❌ Table {table_name} n'existe pas")
-            return False
-        else:
-            print(f"  ❌ Erreur vérification {table_name}: {e}")
-            return False
-
-
 def main():
     """Point d'entrée principal"""
     print("=" * 70)
@@ -139,10 +132,21 @@ def main():
     print(f"📊 Tables à créer: {len(TABLES)}")
     print()
     
-    # Initialiser le client DynamoDB
+    # Erreurs transitoires (throttling, 5xx) relancées par botocore (mode adaptatif)
+    boto_config = Config(
+        retries={'mode': 'adaptive', 'max_attempts': 10},
+        connect_timeout=3,
+        read_timeout=30
+    )
+    
+    def new_resource():
+        # Une ressource boto3 n'est pas thread-safe : une session par thread
+        return boto3.session.Session().resource('dynamodb', region_name=REGION, config=boto_config)
+    
+    # Vérifier la configuration DynamoDB (credentials, région)
     try:
         print("🔗 Connexion à DynamoDB...")
-        dynamodb = boto3.resource('dynamodb', region_name=REGION)
+        new_resource()
         print("✅ Connexion établie")
         print()
     except Exception as e:
@@ -160,45 +164,29 @@ def main():
     print("=" * 70)
     print()
     
-    created_tables = []
-    failed_tables = []
-    
     for table_config in TABLES:
-        table_name = table_config['name']
-        print(f"🔨 {table_name}")
+        print(f"🔨 {table_config['name']}")
         print(f"   Description: {table_config['description']}")
         print(f"   Partition Key: {table_config['partition_key']}")
         print(f"   Sort Key: {table_config['sort_key']}")
-        
-        success = create_table(
-            dynamodb,
-            table_name,
-            table_config['partition_key'],
-            table_config['sort_key'],
-            REGION
-        )
-        
-        if success:
-            created_tables.append(table_name)
-        else:
-            failed_tables.append(table_name)
-        
-        print()
-        time.sleep(1)  # Pause entre les créations
+    print()
     
-    # Vérification des tables
-    print("=" * 70)
-    print("  🔍 Vérification des Tables")
-    print("=" * 70)
+    # Créations lancées en parallèle : les phases CREATING se chevauchent
+    # (chaque thread crée sa propre ressource)
+    with ThreadPoolExecutor(max_workers=len(TABLES)) as executor:
+        results = list(executor.map(
+            lambda c: (c['name'], create_table(
+                new_resource(), c['name'], c['partition_key'], c['sort_key'], REGION
+            )),
+            TABLES
+        ))
     print()
     
-    all_ok = True
-    for table_config in TABLES:
-        table_name = table_config['name']
-        print(f"🔍 Vérification: {table_name}")
-        if not verify_table(dynamodb, table_name):
-            all_ok = False
-        print()
+    created_tables = [table_name for table_name, success in results if success]
+    failed_tables = [table_name for table_name, success in results if not success]
+    
+    # Le waiter garantit que les tables créées sont ACTIVE : pas de seconde vérification
+    all_ok = not failed_tables
     
     # Résumé
     print("=" * 70)
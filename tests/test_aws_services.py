@@ -0,0 +1,71 @@
+"""
+Tests de lecture en streaming des flux API S3 (read_json_items_from_s3)
+"""
+
+import json
+import sys
+import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+# Ajouter le répertoire parent au PYTHONPATH
+_ROOT = str(Path(__file__).resolve().parent.parent)
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from utils import aws_services
+from utils.aws_services import S3Service
+
+
+class FakeS3Client:
+    """Client S3 minimal : get_object sur des objets en mémoire"""
+    
+    def __init__(self, objects):
+        self.objects = objects
+    
+    def get_object(self, Bucket, Key):
+        return {"Body": BytesIO(self.objects[Key])}
+
+
+# Une liste sous "data" et un objet unique sous "data" (format accepté à l'origine)
+PAYLOADS = {
+    "bikes_list.json": {"data": [{"id": 1}, {"id": 2}]},
+    "bikes_dict.json": {"data": {"id": 3}},
+    "traffic_list.json": {"data": [{"disruptions": [{"id": "a"}]}, {"disruptions": [{"id": "b"}]}]},
+    "traffic_dict.json": {"data": {"disruptions": [{"id": "c"}, {"id": "d"}]}},
+}
+
+EXPECTED = {
+    ("bikes_list.json", "data.item"): [{"id": 1}, {"id": 2}],
+    ("bikes_dict.json", "data.item"): [{"id": 3}],
+    ("traffic_list.json", "data.item.disruptions.item"): [{"id": "a"}, {"id": "b"}],
+    ("traffic_dict.json", "data.item.disruptions.item"): [{"id": "c"}, {"id": "d"}],
+}
+
+
+class ReadJsonItemsTest(unittest.TestCase):
+    """Les deux chemins (ijson et fallback) acceptent "data" liste ou objet"""
+    
+    def setUp(self):
+        self.service = S3Service("test-bucket")
+        self.service.s3 = FakeS3Client({
+            key: json.dumps(payload).encode("utf-8") for key, payload in PAYLOADS.items()
+        })
+    
+    def assert_items(self):
+        for (key, item_path), expected in EXPECTED.items():
+            with self.subTest(key=key):
+                self.assertEqual(self.service.read_json_items_from_s3(key, item_path), expected)
+    
+    @unittest.skipUnless(aws_services.IJSON_AVAILABLE, "ijson non installé")
+    def test_streaming(self):
+        self.assert_items()
+    
+    def test_fallback_without_ijson(self):
+        with mock.patch.object(aws_services, "IJSON_AVAILABLE", False):
+            self.assert_items()
+
+
+if __name__ == "__main__":
+    unittest.main()
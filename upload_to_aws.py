@@ -10,12 +10,23 @@ Usage:
     python upload_to_aws.py --type reports     # Seulement rapports
 """
 
+import gzip
 import json
+import logging
+import mmap
 import os
+import random
 import argparse
+import fnmatch
+import shutil
+import tempfile
+import time
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, List
+from decimal import Decimal
+from typing import Dict, Any, List, Optional, Set
 
 # Charger les variables d'environnement
 from dotenv import load_dotenv
@@ -23,20 +34,175 @@ load_dotenv()
 
 try:
     import boto3
-    from botocore.exceptions import ClientError
+    from boto3.dynamodb.types import TypeSerializer
+    from boto3.exceptions import Boto3Error
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
+    from botocore.exceptions import BotoCoreError, ClientError
     BOTO3_AVAILABLE = True
 except ImportError:
     print("❌ boto3 n'est pas installé")
     print("   pip install boto3")
     exit(1)
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Au-delà de cette taille, les fichiers JSON sont mappés en mémoire (mmap) plutôt que copiés
+MMAP_MIN_SIZE = 64 * 1024
+
+# Durée de rétention DynamoDB (TTL)
+_YEAR_SECS = 365 * 24 * 3600
+
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+# Détail par fichier au niveau INFO (affiché avec --verbose)
+log = logging.getLogger("uploader")
+
+# En dessous de cette taille, la compression gzip n'apporte rien (en-têtes)
+GZIP_MIN_SIZE = 1024
+
+# Erreurs attendues : appels AWS (ClientError est relancée par botocore si transitoire),
+# item non sérialisable (TypeError/ValueError), fichier illisible ou JSON invalide
+AWS_ERRORS = (ClientError, BotoCoreError, Boto3Error)
+ITEM_ERRORS = AWS_ERRORS + (TypeError, ValueError)
+FILE_ERRORS = (OSError, ValueError)  # orjson/json.JSONDecodeError héritent de ValueError
+
+# BatchWriteItem : 25 items max par requête, relance des UnprocessedItems (full jitter)
+BATCH_WRITE_MAX_ITEMS = 25
+BATCH_WRITE_MAX_ATTEMPTS = 8
+BATCH_BACKOFF_BASE = 0.05
+BATCH_BACKOFF_CAP = 5.0
+
+# Nombre d'uploads simultanés (I/O réseau : les threads libèrent le GIL)
+UPLOAD_CONCURRENCY = int(os.getenv("UPLOAD_CONCURRENCY", "16"))
+
+
+# Répertoires locaux et patterns des fichiers à uploader
+UPLOAD_SOURCES = {
+    "metrics": (Path("output/metrics"), "*_metrics_{date}.json"),
+    "reports": (Path("output/reports"), "daily_report_{date}.json")
+}
+
+# Listings déjà effectués : (type, date) -> fichiers
+_FILE_CACHE: Dict[tuple, List[Path]] = {}
+
+
+def list_upload_files(kind: str, date_filter: Optional[str] = None) -> List[Path]:
+    """
+    Liste (une seule fois) les fichiers à uploader
+    
+    os.scandir renvoie le type de chaque entrée sans stat supplémentaire.
+    
+    Args:
+        kind: "metrics" ou "reports"
+        date_filter: Date spécifique (YYYY-MM-DD) ou None pour toutes
+    
+    Returns:
+        Liste triée des fichiers (vide si le répertoire n'existe pas)
+    """
+    cache_key = (kind, date_filter)
+    if cache_key not in _FILE_CACHE:
+        directory, pattern = UPLOAD_SOURCES[kind]
+        pattern = pattern.format(date=date_filter or "*")
+        try:
+            with os.scandir(directory) as entries:
+                files = [
+                    Path(entry.path) for entry in entries
+                    if entry.is_file() and fnmatch.fnmatch(entry.name, pattern)
+                ]
+        except FileNotFoundError:
+            files = []
+        _FILE_CACHE[cache_key] = sorted(files)
+    return _FILE_CACHE[cache_key]
+
+
+def _progress(iterable, total: int, desc: str):
+    """
+    Barre de progression (tqdm) quand le détail par fichier n'est pas affiché
+    
+    Args:
+        iterable: Itérable à parcourir
+        total: Nombre d'éléments
+        desc: Libellé de la barre
+    
+    Returns:
+        Itérable (enveloppé par tqdm si disponible)
+    """
+    if TQDM_AVAILABLE and not log.isEnabledFor(logging.INFO):
+        return tqdm(iterable, total=total, desc=desc, unit="fichier")
+    return iterable
+
+
+def _to_dynamodb(value: Any) -> Any:
+    """
+    Convertit récursivement les float en Decimal (seul type numérique accepté par DynamoDB)
+    
+    Args:
+        value: Valeur JSON
+    
+    Returns:
+        Valeur convertie
+    """
+    if isinstance(value, float):
+        return Decimal(str(value))
+    if isinstance(value, dict):
+        return {k: _to_dynamodb(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_to_dynamodb(v) for v in value]
+    return value
+
+
+def _load_json_file(file_path: Path) -> Any:
+    """
+    Charge un fichier JSON (orjson si disponible, via mmap pour les gros fichiers)
+    
+    Args:
+        file_path: Chemin du fichier JSON
+    
+    Returns:
+        Données JSON
+    """
+    if ORJSON_AVAILABLE:
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < MMAP_MIN_SIZE:
+                return orjson.loads(f.read())
+            
+            # Gros fichier : orjson lit directement les pages du cache noyau
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                try:
+                    return orjson.loads(view)
+                finally:
+                    view.release()
+    
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 
 class AWSUploader:
     """Classe pour uploader les données vers AWS"""
     
-    def __init__(self):
-        """Initialise les clients AWS"""
+    def __init__(self, skip_existing: bool = False, batch_size: Optional[int] = None):
+        """
+        Initialise les clients AWS
+        
+        Args:
+            skip_existing: Ne pas réécrire les items déjà présents en base
+                           (put conditionnel, item par item)
+            batch_size: Si défini, écriture via BatchWriteItem bas niveau par lots
+                        de batch_size items (max 25) envoyés en parallèle
+        """
         self.region = os.getenv("AWS_REGION", "eu-west-3")
+        self.skip_existing = skip_existing
+        self.batch_size = min(batch_size, BATCH_WRITE_MAX_ITEMS) if batch_size else None
         
         # Tables DynamoDB
         self.metrics_table_name = os.getenv("DYNAMODB_METRICS_TABLE", "cityflow-metrics")
@@ -46,137 +212,479 @@ class AWSUploader:
         self.reports_bucket = os.getenv("S3_REPORTS_BUCKET", "cityflow-reports-paris")
         self.reports_prefix = os.getenv("S3_REPORTS_PREFIX", "reports")
         
-        # Clients AWS
+        # TTL par défaut (date illisible) calculé une fois, horodatage par défaut à la demande
+        self._ttl_epoch = int(time.time()) + _YEAR_SECS
+        self._now_iso = None
+        
+        # Clients AWS (connexions réutilisées : keep-alive + pool dimensionné pour les threads)
+        # Les erreurs transitoires (throttling, 5xx) sont relancées par botocore en mode
+        # adaptatif (backoff + limitation de débit côté client)
+        config = Config(
+            region_name=self.region,
+            max_pool_connections=max(32, UPLOAD_CONCURRENCY),
+            tcp_keepalive=True,
+            retries={"mode": "adaptive", "max_attempts": 10},
+            connect_timeout=3,
+            read_timeout=30
+        )
         try:
-            self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
-            self.s3 = boto3.client('s3', region_name=self.region)
+            self.dynamodb = boto3.resource('dynamodb', region_name=self.region, config=config)
+            self.s3 = boto3.client('s3', region_name=self.region, config=config)
+            
+            # Client bas niveau (écritures unitaires sans la couche ressource)
+            self._client = self.dynamodb.meta.client
+            self._ser = TypeSerializer()
             
             # Tables
             self.metrics_table = self.dynamodb.Table(self.metrics_table_name)
             self.reports_table = self.dynamodb.Table(self.reports_table_name)
             
+            # Transferts S3 : multipart parallèle au-delà de 8 MB
+            self._transfer_cfg = TransferConfig(
+                multipart_threshold=8 << 20,
+                multipart_chunksize=8 << 20,
+                max_concurrency=8,
+                use_threads=True
+            )
+            
             print(f"✓ Connecté à AWS région {self.region}")
             
-        except Exception as e:
+        except AWS_ERRORS as e:
             print(f"❌ Erreur connexion AWS: {e}")
             exit(1)
     
-    def upload_metrics_file(self, file_path: Path) -> bool:
+    def _default_timestamp(self) -> str:
         """
-        Upload un fichier de métriques vers DynamoDB
+        Horodatage utilisé quand le fichier n'en contient pas (calculé une seule fois)
+        
+        Returns:
+            Date/heure ISO
+        """
+        if self._now_iso is None:
+            self._now_iso = datetime.now().isoformat()
+        return self._now_iso
+    
+    def _serialize(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Sérialise un item au format bas niveau DynamoDB ({"S": ...}, {"N": ...}, {"M": ...})"""
+        return {k: self._ser.serialize(v) for k, v in item.items()}
+    
+    def _put_item(self, table_name: str, item: Dict[str, Any], **kwargs) -> None:
+        """Écrit un item DynamoDB via le client bas niveau (thread-safe)"""
+        self._client.put_item(TableName=table_name, Item=self._serialize(item), **kwargs)
+    
+    def _s3_upload_fileobj(self, fileobj, s3_key: str, extra_args: Dict[str, str]) -> None:
+        """Upload un fichier ouvert vers S3 (depuis son début)"""
+        fileobj.seek(0)
+        self.s3.upload_fileobj(
+            fileobj,
+            self.reports_bucket,
+            s3_key,
+            ExtraArgs=extra_args,
+            Config=self._transfer_cfg
+        )
+    
+    def _ttl_for(self, date: str) -> int:
+        """
+        TTL déterministe : 1 an après la date des données (pas après l'upload)
+        
+        Réuploader un même fichier produit donc exactement le même item.
         
         Args:
-            file_path: Chemin du fichier JSON
+            date: Date au format YYYY-MM-DD
         
         Returns:
-            True si succès
+            Epoch d'expiration
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extraire les infos
-            metric_type = data.get("metric_type")
-            date = data.get("date")
-            metrics = data.get("metrics")
-            
-            if not metric_type or not date or not metrics:
-                print(f"  ⚠ Fichier invalide (champs manquants): {file_path.name}")
+            return int(datetime.strptime(date, "%Y-%m-%d").timestamp()) + _YEAR_SECS
+        except (TypeError, ValueError):
+            return self._ttl_epoch
+    
+    def _upload_files(self, upload_func, files: List[Path]) -> Dict[str, int]:
+        """
+        Upload des fichiers en parallèle
+        
+        Args:
+            upload_func: Fonction d'upload d'un fichier (retourne True si succès)
+            files: Fichiers à uploader
+        
+        Returns:
+            Statistiques d'upload {success: X, failed: Y}
+        """
+        success = 0
+        failed = 0
+        
+        with ThreadPoolExecutor(max_workers=max(1, UPLOAD_CONCURRENCY)) as executor:
+            futures = [executor.submit(upload_func, file_path) for file_path in files]
+            for future in _progress(as_completed(futures), len(futures), "Upload"):
+                if future.result():
+                    success += 1
+                else:
+                    failed += 1
+        
+        return {"success": success, "failed": failed}
+    
+    def _batch_put(self, table, key_names: List[str], entries: List[tuple], label) -> List[bool]:
+        """
+        Écrit des items DynamoDB par lots de 25, un lot à la fois
+        
+        Passe par _batch_write_chunk : un item n'est compté comme écrit
+        qu'une fois le BatchWriteItem qui le contient confirmé (hors
+        UnprocessedItems). Un lot en échec marque tous ses items en échec.
+        
+        Args:
+            table: Table DynamoDB
+            key_names: Clés primaires (dédoublonnage dans un même lot)
+            entries: Liste de (file_path, item) ; item None = fichier invalide
+            label: Fonction item -> libellé affiché en cas de succès
+        
+        Returns:
+            Statut par entrée (True si écrit)
+        """
+        return self._batch_write_serialized(
+            table, key_names, entries, label, batch_size=BATCH_WRITE_MAX_ITEMS, max_workers=1
+        )
+    
+    def _put_new_items(self, table, partition_key: str, entries: List[tuple], label) -> List[Optional[bool]]:
+        """
+        Écrit en parallèle uniquement les items absents de la table (PutItem conditionnel)
+        
+        Args:
+            table: Table DynamoDB
+            partition_key: Partition key (condition attribute_not_exists)
+            entries: Liste de (file_path, item) ; item None = fichier invalide
+            label: Fonction item -> libellé affiché en cas de succès
+        
+        Returns:
+            Statut par entrée (True si écrit, None si déjà présent, False si erreur)
+        """
+        def put(entry):
+            file_path, item = entry
+            if item is None:
                 return False
-            
-            # Préparer l'item DynamoDB
-            item = {
-                "metric_type": metric_type,
-                "date": date,
-                "timestamp": data.get("timestamp", datetime.now().isoformat()),
-                "metrics": metrics,
-                "ttl": int((datetime.now().timestamp() + (365 * 24 * 3600)))  # TTL 1 an
+            try:
+                self._put_item(
+                    table.name, item, ConditionExpression=f"attribute_not_exists({partition_key})"
+                )
+                log.info("  ✓ %s", label(item))
+                return True
+            except ClientError as e:
+                if e.response['Error']['Code'] == 'ConditionalCheckFailedException':
+                    log.info("  ↷ Déjà présent: %s", file_path.name)
+                    return None
+                log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+                return False
+            except ITEM_ERRORS as e:
+                log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+                return False
+        
+        with ThreadPoolExecutor(max_workers=max(1, UPLOAD_CONCURRENCY)) as executor:
+            return list(_progress(executor.map(put, entries), len(entries), "DynamoDB"))
+    
+    def _batch_write_chunk(self, table_name: str, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Envoie un lot d'items sérialisés via BatchWriteItem (client bas niveau)
+        
+        Les UnprocessedItems renvoyés par DynamoDB sont relancés après une
+        attente aléatoire (full jitter) : uniform(0, min(cap, base * 2**tentative)).
+        
+        Args:
+            table_name: Nom de la table
+            chunk: Items déjà sérialisés et dédoublonnés (25 max)
+        
+        Returns:
+            Items non écrits après toutes les tentatives
+        """
+        pending = [{'PutRequest': {'Item': item}} for item in chunk]
+        
+        for attempt in range(BATCH_WRITE_MAX_ATTEMPTS):
+            response = self._client.batch_write_item(RequestItems={table_name: pending})
+            pending = response.get('UnprocessedItems', {}).get(table_name, [])
+            if not pending:
+                return []
+            time.sleep(random.uniform(0, min(BATCH_BACKOFF_CAP, BATCH_BACKOFF_BASE * 2 ** attempt)))
+        
+        return [request['PutRequest']['Item'] for request in pending]
+    
+    def _batch_write_serialized(self, table, key_names: List[str], entries: List[tuple],
+                                label, batch_size: Optional[int] = None,
+                                max_workers: Optional[int] = None) -> List[Optional[bool]]:
+        """
+        Écrit les items par lots BatchWriteItem bas niveau, lots envoyés en parallèle
+        
+        Args:
+            table: Table DynamoDB
+            key_names: Clés primaires
+            entries: Liste de (file_path, item) ; item None = fichier invalide
+            label: Fonction item -> libellé affiché en cas de succès
+            batch_size: Items par lot (défaut: self.batch_size)
+            max_workers: Lots envoyés simultanément (défaut: UPLOAD_CONCURRENCY)
+        
+        Returns:
+            Statut par entrée (True si écrit)
+        """
+        def key_of(serialized: Dict[str, Any]) -> tuple:
+            return tuple(next(iter(serialized[k].values())) for k in key_names)
+        
+        # Sérialisation unique ; une même clé ne peut apparaître qu'une fois par requête
+        # (la dernière occurrence l'emporte, comme overwrite_by_pkeys)
+        by_key = {}
+        for i, (file_path, item) in enumerate(entries):
+            if item is None:
+                continue
+            try:
+                serialized = self._serialize(item)
+            except (TypeError, ValueError) as e:
+                log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+                continue
+            by_key[key_of(serialized)] = (i, serialized)
+        
+        indexes = {key: i for key, (i, _) in by_key.items()}
+        serialized_items = [serialized for _, serialized in by_key.values()]
+        batch_size = batch_size or self.batch_size
+        chunks = [
+            serialized_items[i:i + batch_size]
+            for i in range(0, len(serialized_items), batch_size)
+        ]
+        
+        written = set()
+        with ThreadPoolExecutor(max_workers=max(1, max_workers or UPLOAD_CONCURRENCY)) as executor:
+            futures = {
+                executor.submit(self._batch_write_chunk, table.name, chunk): chunk
+                for chunk in chunks
             }
-            
-            # Upload vers DynamoDB
-            self.metrics_table.put_item(Item=item)
-            
-            print(f"  ✓ Métriques uploadées: {metric_type} - {date}")
-            return True
-            
-        except Exception as e:
-            print(f"  ✗ Erreur upload {file_path.name}: {e}")
-            return False
+            for future in _progress(as_completed(futures), len(futures), "BatchWriteItem"):
+                chunk = futures[future]
+                try:
+                    unprocessed = {key_of(item) for item in future.result()}
+                except AWS_ERRORS as e:
+                    log.error("  ✗ Erreur écriture groupée %s: %s", table.name, e)
+                    continue
+                for item in chunk:
+                    key = key_of(item)
+                    if key not in unprocessed:
+                        written.add(indexes[key])
+                    else:
+                        log.error("  ✗ Item non écrit après relances: %s", entries[indexes[key]][0].name)
+        
+        statuses = [False] * len(entries)
+        for i, (file_path, item) in enumerate(entries):
+            if i in written:
+                statuses[i] = True
+                log.info("  ✓ %s", label(item))
+        return statuses
     
-    def upload_report_file(self, file_path: Path) -> bool:
+    def _write_items(self, table, key_names: List[str], entries: List[tuple], label) -> List[Optional[bool]]:
         """
-        Upload un fichier de rapport vers DynamoDB et S3
+        Écrit les items : par lots BatchWriteItem (séquentiels, ou en parallèle
+        si batch_size), ou item par item si skip_existing
+        
+        Args:
+            table: Table DynamoDB
+            key_names: Clés primaires (partition key en premier)
+            entries: Liste de (file_path, item) ; item None = fichier invalide
+            label: Fonction item -> libellé affiché en cas de succès
+        
+        Returns:
+            Statut par entrée (True si écrit, None si déjà présent, False si erreur)
+        """
+        if self.skip_existing:
+            # BatchWriteItem ne supporte pas les conditions
+            return self._put_new_items(table, key_names[0], entries, label)
+        if self.batch_size:
+            return self._batch_write_serialized(table, key_names, entries, label)
+        return self._batch_put(table, key_names, entries, label)
+    
+    def _build_metric_item(self, file_path: Path) -> Optional[Dict[str, Any]]:
+        """
+        Lit un fichier de métriques et construit l'item DynamoDB
+        
+        Args:
+            file_path: Chemin du fichier JSON
+        
+        Returns:
+            Item DynamoDB ou None si fichier invalide
+        """
+        try:
+            data = _load_json_file(file_path)
+        except FILE_ERRORS as e:
+            log.error("  ✗ Erreur lecture %s: %s", file_path.name, e)
+            return None
+        
+        if not isinstance(data, dict):
+            log.warning("  ⚠ Fichier invalide (objet JSON attendu): %s", file_path.name)
+            return None
+        
+        # Extraire les infos
+        metric_type = data.get("metric_type")
+        date = data.get("date")
+        metrics = data.get("metrics")
+        
+        if not metric_type or not date or not metrics:
+            log.warning("  ⚠ Fichier invalide (champs manquants): %s", file_path.name)
+            return None
+        
+        # Préparer l'item DynamoDB
+        return {
+            "metric_type": metric_type,
+            "date": date,
+            "timestamp": data.get("timestamp") or self._default_timestamp(),
+            "metrics": _to_dynamodb(metrics),
+            "ttl": self._ttl_for(date)  # TTL 1 an après la date des données
+        }
+    
+    def _build_report_item(self, file_path: Path) -> Optional[tuple]:
+        """
+        Lit un fichier de rapport et construit l'item DynamoDB
         
         Args:
             file_path: Chemin du fichier JSON
         
+        Returns:
+            Tuple (données du fichier, item DynamoDB) ou None si fichier invalide
+        """
+        try:
+            data = _load_json_file(file_path)
+        except FILE_ERRORS as e:
+            log.error("  ✗ Erreur lecture %s: %s", file_path.name, e)
+            return None
+        
+        if not isinstance(data, dict):
+            log.warning("  ⚠ Fichier invalide (objet JSON attendu): %s", file_path.name)
+            return None
+        
+        # Extraire les infos
+        report_id = data.get("report_id")
+        date = data.get("date")
+        report = data.get("report")
+        
+        if not report_id or not date or not report:
+            log.warning("  ⚠ Fichier invalide (champs manquants): %s", file_path.name)
+            return None
+        
+        item = {
+            "report_id": report_id,
+            "date": date,
+            "timestamp": data.get("timestamp") or self._default_timestamp(),
+            "report": _to_dynamodb(report),
+            "ttl": self._ttl_for(date)  # TTL 1 an après la date des données
+        }
+        return data, item
+    
+    def _upload_report_to_s3(self, file_path: Path, data: Dict[str, Any],
+                             csv_names: Optional[Set[str]] = None) -> bool:
+        """
+        Upload un rapport (JSON complet + CSV si existe) vers S3
+        
+        Args:
+            file_path: Chemin du fichier JSON (envoyé tel quel)
+            data: Contenu du rapport déjà parsé (sert uniquement à la date)
+            csv_names: Noms des CSV présents dans le répertoire (déjà listés),
+                       None pour tester l'existence du fichier
+        
         Returns:
             True si succès
         """
+        date = data["date"]
+        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            # Extraire les infos
-            report_id = data.get("report_id")
-            date = data.get("date")
-            report = data.get("report")
-            
-            if not report_id or not date or not report:
-                print(f"  ⚠ Fichier invalide (champs manquants): {file_path.name}")
-                return False
-            
-            # 1. Upload vers DynamoDB
-            item = {
-                "report_id": report_id,
-                "date": date,
-                "timestamp": data.get("timestamp", datetime.now().isoformat()),
-                "report": report,
-                "ttl": int((datetime.now().timestamp() + (365 * 24 * 3600)))  # TTL 1 an
-            }
-            
-            self.reports_table.put_item(Item=item)
-            print(f"  ✓ Rapport DynamoDB: {date}")
-            
-            # 2. Upload vers S3 (JSON complet)
+            # JSON complet : octets du fichier tels quels (pas de re-sérialisation),
+            # compressés gzip sous la même clé (ContentEncoding) : décompressés à la
+            # volée par les clients HTTP et par les lecteurs de S3Service
             s3_key = f"{self.reports_prefix}/daily_report_{date}.json"
-            self.s3.put_object(
-                Bucket=self.reports_bucket,
-                Key=s3_key,
-                Body=json.dumps(data, indent=2, ensure_ascii=False, default=str).encode('utf-8'),
-                ContentType='application/json'
-            )
-            print(f"  ✓ Rapport S3: s3://{self.reports_bucket}/{s3_key}")
+            body = file_path.read_bytes()
+            extra_args = {'ContentType': 'application/json'}
+            if len(body) >= GZIP_MIN_SIZE:
+                body = gzip.compress(body, compresslevel=6)
+                extra_args['ContentEncoding'] = 'gzip'
+            self._s3_upload_fileobj(BytesIO(body), s3_key, extra_args)
+            log.info("  ✓ Rapport S3: s3://%s/%s", self.reports_bucket, s3_key)
             
-            # 3. Upload CSV si existe
+            # CSV si existe
             csv_path = file_path.parent / f"daily_report_{date}.csv"
-            if csv_path.exists():
+            if csv_path.name in csv_names if csv_names is not None else csv_path.exists():
                 s3_csv_key = f"{self.reports_prefix}/daily_report_{date}.csv"
-                self.s3.upload_file(
-                    str(csv_path),
-                    self.reports_bucket,
-                    s3_csv_key,
-                    ExtraArgs={'ContentType': 'text/csv'}
-                )
-                print(f"  ✓ Rapport CSV S3: s3://{self.reports_bucket}/{s3_csv_key}")
+                if csv_path.stat().st_size < GZIP_MIN_SIZE:
+                    with open(csv_path, 'rb') as fh:
+                        self._s3_upload_fileobj(fh, s3_csv_key, {'ContentType': 'text/csv'})
+                else:
+                    # Compression dans un fichier temporaire (le CSV peut être volumineux)
+                    with tempfile.TemporaryFile() as tmp:
+                        with open(csv_path, 'rb') as src, gzip.GzipFile(fileobj=tmp, mode='wb', compresslevel=6) as gz:
+                            shutil.copyfileobj(src, gz)
+                        self._s3_upload_fileobj(
+                            tmp, s3_csv_key, {'ContentType': 'text/csv', 'ContentEncoding': 'gzip'}
+                        )
+                log.info("  ✓ Rapport CSV S3: s3://%s/%s", self.reports_bucket, s3_csv_key)
             
             return True
             
-        except Exception as e:
-            print(f"  ✗ Erreur upload {file_path.name}: {e}")
+        except AWS_ERRORS + (OSError,) as e:
+            log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+            return False
+    
+    def upload_metrics_file(self, file_path: Path) -> bool:
+        """
+        Upload un fichier de métriques vers DynamoDB
+        
+        Args:
+            file_path: Chemin du fichier JSON
+        
+        Returns:
+            True si succès
+        """
+        item = self._build_metric_item(file_path)
+        if item is None:
+            return False
+        
+        try:
+            self._put_item(self.metrics_table_name, item)
+            log.info("  ✓ Métriques uploadées: %s - %s", item['metric_type'], item['date'])
+            return True
+        except ITEM_ERRORS as e:
+            log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+            return False
+    
+    def upload_report_file(self, file_path: Path) -> bool:
+        """
+        Upload un fichier de rapport vers DynamoDB et S3
+        
+        Args:
+            file_path: Chemin du fichier JSON
+        
+        Returns:
+            True si succès
+        """
+        built = self._build_report_item(file_path)
+        if built is None:
             return False
+        data, item = built
+        
+        try:
+            self._put_item(self.reports_table_name, item)
+            log.info("  ✓ Rapport DynamoDB: %s", item['date'])
+        except ITEM_ERRORS as e:
+            log.error("  ✗ Erreur upload %s: %s", file_path.name, e)
+            return False
+        
+        return self._upload_report_to_s3(file_path, data)
     
-    def upload_all_metrics(self, date_filter: str = None) -> Dict[str, int]:
+    def upload_all_metrics(self, date_filter: str = None,
+                           files: Optional[List[Path]] = None) -> Dict[str, int]:
         """
         Upload toutes les métriques
         
+        Les fichiers sont lus en parallèle puis écrits par lots de 25
+        (BatchWriteItem) au lieu d'un put_item par fichier.
+        
         Args:
             date_filter: Date spécifique (YYYY-MM-DD) ou None pour toutes
+            files: Fichiers déjà listés (défaut: listés via list_upload_files)
         
         Returns:
-            Statistiques d'upload {success: X, failed: Y}
+            Statistiques d'upload {success: X, failed: Y, skipped: Z}
         """
-        metrics_dir = Path("output/metrics")
+        metrics_dir = UPLOAD_SOURCES["metrics"][0]
         
         if not metrics_dir.exists():
             print(f"❌ Répertoire métriques non trouvé: {metrics_dir}")
@@ -186,38 +694,46 @@ class AWSUploader:
         print(f"   Table: {self.metrics_table_name}")
         print(f"   Répertoire: {metrics_dir}")
         
-        success = 0
-        failed = 0
-        
         # Lister les fichiers
-        pattern = f"*_metrics_{date_filter}.json" if date_filter else "*_metrics_*.json"
-        files = sorted(metrics_dir.glob(pattern))
+        if files is None:
+            files = list_upload_files("metrics", date_filter)
         
         if not files:
-            print(f"  ⚠ Aucun fichier trouvé avec le pattern: {pattern}")
+            print(f"  ⚠ Aucun fichier trouvé pour la date: {date_filter or 'toutes'}")
             return {"success": 0, "failed": 0}
         
         print(f"  → {len(files)} fichier(s) trouvé(s)\n")
         
-        for file_path in files:
-            if self.upload_metrics_file(file_path):
-                success += 1
-            else:
-                failed += 1
+        with ThreadPoolExecutor(max_workers=max(1, UPLOAD_CONCURRENCY)) as executor:
+            items = list(executor.map(self._build_metric_item, files))
         
-        return {"success": success, "failed": failed}
+        statuses = self._write_items(
+            self.metrics_table, ["metric_type", "date"], list(zip(files, items)),
+            lambda item: f"Métriques uploadées: {item['metric_type']} - {item['date']}"
+        )
+        
+        return {
+            "success": statuses.count(True),
+            "failed": statuses.count(False),
+            "skipped": statuses.count(None)
+        }
     
-    def upload_all_reports(self, date_filter: str = None) -> Dict[str, int]:
+    def upload_all_reports(self, date_filter: str = None,
+                           files: Optional[List[Path]] = None) -> Dict[str, int]:
         """
         Upload tous les rapports
         
+        Les items DynamoDB sont écrits par lots (BatchWriteItem), puis les
+        fichiers sont envoyés vers S3 en parallèle.
+        
         Args:
             date_filter: Date spécifique (YYYY-MM-DD) ou None pour tous
+            files: Fichiers déjà listés (défaut: listés via list_upload_files)
         
         Returns:
-            Statistiques d'upload {success: X, failed: Y}
+            Statistiques d'upload {success: X, failed: Y, skipped: Z}
         """
-        reports_dir = Path("output/reports")
+        reports_dir = UPLOAD_SOURCES["reports"][0]
         
         if not reports_dir.exists():
             print(f"❌ Répertoire rapports non trouvé: {reports_dir}")
@@ -228,26 +744,45 @@ class AWSUploader:
         print(f"   Bucket: {self.reports_bucket}")
         print(f"   Répertoire: {reports_dir}")
         
-        success = 0
-        failed = 0
-        
         # Lister les fichiers JSON
-        pattern = f"daily_report_{date_filter}.json" if date_filter else "daily_report_*.json"
-        files = sorted(reports_dir.glob(pattern))
+        if files is None:
+            files = list_upload_files("reports", date_filter)
         
         if not files:
-            print(f"  ⚠ Aucun fichier trouvé avec le pattern: {pattern}")
+            print(f"  ⚠ Aucun fichier trouvé pour la date: {date_filter or 'toutes'}")
             return {"success": 0, "failed": 0}
         
         print(f"  → {len(files)} fichier(s) trouvé(s)\n")
         
-        for file_path in files:
-            if self.upload_report_file(file_path):
-                success += 1
-            else:
-                failed += 1
+        with ThreadPoolExecutor(max_workers=max(1, UPLOAD_CONCURRENCY)) as executor:
+            built = list(executor.map(self._build_report_item, files))
         
-        return {"success": success, "failed": failed}
+        # 1. DynamoDB par lots
+        statuses = self._write_items(
+            self.reports_table, ["report_id", "date"],
+            [(file_path, b[1] if b else None) for file_path, b in zip(files, built)],
+            lambda item: f"Rapport DynamoDB: {item['date']}"
+        )
+        
+        # 2. S3 en parallèle pour les rapports écrits en base
+        # (CSV listés une fois au lieu d'un stat par rapport)
+        try:
+            with os.scandir(reports_dir) as entries:
+                csv_names = {
+                    entry.name for entry in entries
+                    if entry.name.startswith("daily_report_") and entry.name.endswith(".csv")
+                }
+        except OSError:
+            csv_names = None
+        
+        data_by_path = {file_path: b[0] for file_path, b, ok in zip(files, built, statuses) if ok}
+        stats = self._upload_files(
+            lambda file_path: self._upload_report_to_s3(file_path, data_by_path[file_path], csv_names),
+            list(data_by_path)
+        )
+        stats["failed"] += statuses.count(False)
+        stats["skipped"] = statuses.count(None)
+        return stats
 
 
 def main():
@@ -262,6 +797,9 @@ Exemples:
   python upload_to_aws.py --type metrics       # Seulement métriques
   python upload_to_aws.py --type reports       # Seulement rapports
   python upload_to_aws.py --dry-run            # Simulation (pas d'upload)
+  python upload_to_aws.py --skip-existing      # Ne pas réécrire l'existant
+  python upload_to_aws.py --batch-size 25      # Backfill massif (BatchWriteItem)
+  python upload_to_aws.py --verbose            # Détail par fichier
         """
     )
     
@@ -284,32 +822,56 @@ Exemples:
         help="Mode simulation (liste les fichiers sans uploader)"
     )
     
+    parser.add_argument(
+        "--skip-existing",
+        action="store_true",
+        help="Ne pas réécrire les items déjà présents dans DynamoDB (put conditionnel)"
+    )
+    
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        metavar="N",
+        help="Écriture DynamoDB via BatchWriteItem bas niveau, lots de N items (max 25) en parallèle"
+    )
+    
+    parser.add_argument(
+        "-v", "--verbose",
+        action="store_true",
+        help="Afficher le détail de chaque fichier uploadé"
+    )
+    
     args = parser.parse_args()
+    if args.batch_size is not None and not 1 <= args.batch_size <= BATCH_WRITE_MAX_ITEMS:
+        parser.error(f"--batch-size doit être compris entre 1 et {BATCH_WRITE_MAX_ITEMS}")
+    
+    # Erreurs et avertissements toujours affichés, détail par fichier avec --verbose
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.WARNING, format="%(message)s")
     
     print("=" * 70)
     print("  🚀 CityFlow - Upload vers AWS")
     print("=" * 70)
     
+    # Lister les fichiers une seule fois (partagé entre dry-run et upload réel)
+    kinds = ["metrics", "reports"] if args.type == "all" else [args.type]
+    files_by_kind = {kind: list_upload_files(kind, args.date) for kind in kinds}
+    
     # Mode dry-run
     if args.dry_run:
         print("\n⚠️  MODE SIMULATION (--dry-run)")
         print("   Aucun fichier ne sera uploadé\n")
         
         # Lister les fichiers qui seraient uploadés
-        if args.type in ["metrics", "all"]:
-            metrics_dir = Path("output/metrics")
-            pattern = f"*_metrics_{args.date}.json" if args.date else "*_metrics_*.json"
-            files = sorted(metrics_dir.glob(pattern))
+        if "metrics" in files_by_kind:
+            files = files_by_kind["metrics"]
             print(f"📊 Métriques à uploader: {len(files)} fichier(s)")
             for f in files[:5]:
                 print(f"   - {f.name}")
             if len(files) > 5:
                 print(f"   ... et {len(files) - 5} autre(s)")
         
-        if args.type in ["reports", "all"]:
-            reports_dir = Path("output/reports")
-            pattern = f"daily_report_{args.date}.json" if args.date else "daily_report_*.json"
-            files = sorted(reports_dir.glob(pattern))
+        if "reports" in files_by_kind:
+            files = files_by_kind["reports"]
             print(f"\n📈 Rapports à uploader: {len(files)} fichier(s)")
             for f in files[:5]:
                 print(f"   - {f.name}")
@@ -321,28 +883,33 @@ Exemples:
     
     # Upload réel
     try:
-        uploader = AWSUploader()
+        uploader = AWSUploader(skip_existing=args.skip_existing, batch_size=args.batch_size)
         
         total_success = 0
         total_failed = 0
+        total_skipped = 0
         
         # Upload métriques
-        if args.type in ["metrics", "all"]:
-            stats = uploader.upload_all_metrics(args.date)
+        if "metrics" in files_by_kind:
+            stats = uploader.upload_all_metrics(args.date, files_by_kind["metrics"])
             total_success += stats["success"]
             total_failed += stats["failed"]
+            total_skipped += stats.get("skipped", 0)
         
         # Upload rapports
-        if args.type in ["reports", "all"]:
-            stats = uploader.upload_all_reports(args.date)
+        if "reports" in files_by_kind:
+            stats = uploader.upload_all_reports(args.date, files_by_kind["reports"])
             total_success += stats["success"]
             total_failed += stats["failed"]
+            total_skipped += stats.get("skipped", 0)
         
         # Résumé
         print("\n" + "=" * 70)
         print("  ✅ UPLOAD TERMINÉ")
         print("=" * 70)
         print(f"  ✓ Succès: {total_success}")
+        if total_skipped > 0:
+            print(f"  ↷ Déjà présents (ignorés): {total_skipped}")
         if total_failed > 0:
             print(f"  ✗ Échecs: {total_failed}")
         print("=" * 70)
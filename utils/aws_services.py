@@ -1,20 +1,198 @@
 """
 Services AWS : DynamoDB et S3
 Utilisé pour stocker métriques et rapports
+
+boto3 n'est importé qu'au premier appel AWS : un processus qui n'utilise
+que les fichiers locaux ne charge jamais la pile botocore.
 """
 
+import functools
+import gzip
+import importlib.util
 import json
 import os
-from typing import Dict, Any, Optional, List
+import reprlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, List, Set, Tuple, BinaryIO, Iterator, Union
 from datetime import datetime
+from io import BytesIO
+
+BOTO3_AVAILABLE = importlib.util.find_spec("boto3") is not None
+if not BOTO3_AVAILABLE:
+    print("⚠ boto3 non disponible, utilisation mode simulation (local)")
 
 try:
-    import boto3
-    from botocore.exceptions import ClientError
-    BOTO3_AVAILABLE = True
+    import ijson
+    IJSON_AVAILABLE = True
 except ImportError:
-    BOTO3_AVAILABLE = False
-    print("⚠ boto3 non disponible, utilisation mode simulation (local)")
+    IJSON_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Parse JSON directement depuis des bytes (pas de décodage UTF-8 intermédiaire avec orjson)
+_json_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Configuration lue une seule fois à l'import (.env déjà chargé par config.settings)
+_AWS_REGION = os.getenv("AWS_REGION", "eu-west-3")
+_DYNAMO_METRICS_TABLE = os.getenv("DYNAMODB_METRICS_TABLE")
+_DYNAMO_REPORTS_TABLE = os.getenv("DYNAMODB_REPORTS_TABLE", "cityflow-daily-reports")
+_S3_REPORTS_BUCKET = os.getenv("S3_REPORTS_BUCKET", "cityflow-reports")
+_S3_REPORTS_PREFIX = os.getenv("S3_REPORTS_PREFIX", "reports")
+
+# Transferts S3 : multipart / plages de 8 MB envoyées en parallèle au-delà de 8 MB
+MULTIPART_THRESHOLD = 8 << 20
+TRANSFER_MAX_CONCURRENCY = int(os.getenv("S3_TRANSFER_CONCURRENCY", "16"))
+
+# TTL des éléments DynamoDB (défaut : 1 an)
+_DAY_SECS = 24 * 3600
+DEFAULT_TTL_DAYS = 365
+_time = time.time
+
+# Durée de validité (secondes) d'un listing de préfixe utilisé par file_exists
+EXISTS_CACHE_TTL = 5.0
+
+_BOTO3 = None
+
+
+def _boto3():
+    """
+    Importe boto3 au premier usage
+    
+    Returns:
+        Module boto3
+    """
+    global _BOTO3
+    if _BOTO3 is None:
+        import boto3
+        _BOTO3 = boto3
+    return _BOTO3
+
+
+@functools.lru_cache(maxsize=None)
+def _client_error() -> type:
+    """
+    Retourne botocore.exceptions.ClientError (importé au premier usage)
+    
+    Returns:
+        Classe d'exception ClientError
+    """
+    from botocore.exceptions import ClientError
+    return ClientError
+
+
+@functools.lru_cache(maxsize=None)
+def _conditions() -> Tuple[Any, Any]:
+    """
+    Retourne les constructeurs de conditions DynamoDB (Key, Attr)
+    
+    Returns:
+        Tuple (Key, Attr)
+    """
+    from boto3.dynamodb.conditions import Key, Attr
+    return Key, Attr
+
+
+@functools.lru_cache(maxsize=None)
+def _boto_config():
+    """
+    Connexions HTTP persistantes (keepalive) et retries adaptatifs pour DynamoDB et S3
+    
+    Returns:
+        botocore Config
+    """
+    from botocore.config import Config
+    return Config(
+        max_pool_connections=64,
+        retries={"mode": "adaptive", "max_attempts": 5},
+        tcp_keepalive=True,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _transfer_config():
+    """
+    Transferts S3 gérés par boto3 : uploads multipart et GET par plages
+    concurrents au-delà de 8 MB
+    
+    Returns:
+        TransferConfig
+    """
+    from boto3.s3.transfer import TransferConfig
+    return TransferConfig(
+        multipart_threshold=MULTIPART_THRESHOLD,
+        multipart_chunksize=MULTIPART_THRESHOLD,
+        max_concurrency=TRANSFER_MAX_CONCURRENCY,
+        use_threads=True,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _s3_client(region_name: str):
+    """
+    Retourne un client S3 partagé par région (pool de connexions réutilisé)
+    
+    Args:
+        region_name: Région AWS
+    
+    Returns:
+        Client boto3 S3
+    """
+    return _boto3().client("s3", region_name=region_name, config=_boto_config())
+
+
+def _preview(item: Dict[str, Any], limit: int = 100) -> str:
+    """
+    Aperçu tronqué d'un élément pour les logs de simulation
+    
+    Les champs sont formatés un par un avec reprlib (conteneurs et chaînes
+    tronqués pendant le formatage) et la boucle s'arrête dès que la limite
+    est atteinte : un gros élément n'est jamais sérialisé en entier.
+    
+    Args:
+        item: Élément (dict)
+        limit: Nombre maximal de caractères
+    
+    Returns:
+        Aperçu "clé=valeur, ..." tronqué
+    """
+    pieces = []
+    total = 0
+    for key, value in item.items():
+        piece = f"{key}={reprlib.repr(value)}, "
+        pieces.append(piece)
+        total += len(piece)
+        if total >= limit:
+            break
+    return "".join(pieces)[:limit]
+
+
+def _extract_items(data: Any, item_path: str) -> List[Any]:
+    """
+    Extrait les éléments d'un document JSON déjà chargé selon un chemin ijson
+    
+    Args:
+        data: Document JSON
+        item_path: Chemin au format ijson (ex: "data.item.disruptions.item")
+    
+    Returns:
+        Liste des éléments trouvés
+    """
+    nodes = [data]
+    for part in item_path.split('.') if item_path else []:
+        next_nodes = []
+        for node in nodes:
+            if part == "item":
+                next_nodes.extend(node if isinstance(node, list) else [node])
+            elif isinstance(node, dict) and part in node:
+                next_nodes.append(node[part])
+        nodes = next_nodes
+    return nodes
 
 
 class DynamoDBService:
@@ -29,11 +207,12 @@ class DynamoDBService:
             region_name: Région AWS (défaut: depuis env ou eu-west-3)
         """
         self.table_name = table_name
-        self.region_name = region_name or os.getenv("AWS_REGION", "eu-west-3")
+        self.region_name = region_name or _AWS_REGION
+        self._key_fields = None
         
         if BOTO3_AVAILABLE:
             try:
-                self.dynamodb = boto3.resource("dynamodb", region_name=self.region_name)
+                self.dynamodb = _boto3().resource("dynamodb", region_name=self.region_name, config=_boto_config())
                 self.table = self.dynamodb.Table(table_name)
             except Exception as e:
                 print(f"⚠ Erreur initialisation DynamoDB: {e}")
@@ -44,25 +223,67 @@ class DynamoDBService:
     
     def put_item(self, item: Dict[str, Any]) -> bool:
         """
-        Insère ou met à jour un élément dans DynamoDB
+        Insère ou met à jour un élément dans DynamoDB (écriture immédiate)
         
         Args:
             item: Élément à insérer (dict)
         
         Returns:
-            True si succès
+            True si l'élément est écrit
         """
         if not self.table:
-            print(f"[SIMULATION] DynamoDB.put_item({self.table_name}): {json.dumps(item, default=str)[:100]}...")
+            print(f"[SIMULATION] DynamoDB.put_item({self.table_name}): {_preview(item)}...")
             return True
         
         try:
             self.table.put_item(Item=item)
             return True
-        except ClientError as e:
+        except _client_error() as e:
             print(f"✗ Erreur DynamoDB.put_item: {e}")
             return False
     
+    def _get_key_fields(self) -> Optional[List[str]]:
+        """
+        Retourne les attributs de la clé primaire de la table (mis en cache)
+        
+        Returns:
+            Noms des attributs de clé ou None si indisponibles
+        """
+        if self._key_fields is None:
+            try:
+                self._key_fields = [k["AttributeName"] for k in self.table.key_schema]
+            except _client_error() as e:
+                print(f"⚠ Schéma de clé DynamoDB indisponible ({self.table_name}): {e}")
+                return None
+        return self._key_fields
+    
+    def put_items(self, items: List[Dict[str, Any]]) -> bool:
+        """
+        Insère plusieurs éléments via BatchWriteItem (groupes de 25)
+        
+        Le batch_writer de boto3 découpe en requêtes de 25 éléments et
+        renvoie automatiquement les UnprocessedItems. Les doublons de clé
+        dans un même lot sont dédupliqués (le dernier l'emporte).
+        
+        Args:
+            items: Éléments à insérer
+        
+        Returns:
+            True si succès
+        """
+        if not self.table:
+            print(f"[SIMULATION] DynamoDB.put_items({self.table_name}): {len(items)} élément(s)")
+            return True
+        
+        try:
+            with self.table.batch_writer(overwrite_by_pkeys=self._get_key_fields()) as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            return True
+        except _client_error() as e:
+            print(f"✗ Erreur DynamoDB.put_items: {e}")
+            return False
+    
     def get_item(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Récupère un élément depuis DynamoDB
@@ -80,7 +301,7 @@ class DynamoDBService:
         try:
             response = self.table.get_item(Key=key)
             return response.get("Item")
-        except ClientError as e:
+        except _client_error() as e:
             print(f"✗ Erreur DynamoDB.get_item: {e}")
             return None
     
@@ -88,6 +309,11 @@ class DynamoDBService:
         """
         Interroge DynamoDB par date
         
+        Utilise l'index secondaire global "date-index" (clé de partition:
+        le champ date, type S) pour une lecture ciblée. Si la table n'a pas
+        cet index, repli sur un scan filtré de toute la table. Les résultats
+        sont paginés (LastEvaluatedKey) pour ne pas être tronqués à 1 MB.
+        
         Args:
             date: Date au format YYYY-MM-DD
             date_field: Nom du champ date
@@ -100,14 +326,60 @@ class DynamoDBService:
             return []
         
         try:
-            from boto3.dynamodb.conditions import Key, Attr
-            response = self.table.scan(
+            Key, Attr = _conditions()
+            
+            try:
+                return self._paginate(
+                    self.table.query,
+                    IndexName="date-index",
+                    KeyConditionExpression=Key(date_field).eq(date)
+                )
+            except _client_error() as e:
+                if e.response.get("Error", {}).get("Code") != "ValidationException":
+                    raise
+                print(f"⚠ Index date-index absent sur {self.table_name}, repli sur scan")
+            
+            return self._paginate(
+                self.table.scan,
                 FilterExpression=Attr(date_field).eq(date)
             )
-            return response.get("Items", [])
         except Exception as e:
             print(f"✗ Erreur DynamoDB.query_by_date: {e}")
             return []
+    
+    @staticmethod
+    def _paginate(operation, **kwargs) -> List[Dict[str, Any]]:
+        """
+        Exécute une opération query/scan en suivant LastEvaluatedKey
+        
+        Args:
+            operation: Méthode de la table (query ou scan)
+            **kwargs: Paramètres de l'opération
+        
+        Returns:
+            Tous les éléments de toutes les pages
+        """
+        items = []
+        while True:
+            response = operation(**kwargs)
+            items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return items
+            kwargs["ExclusiveStartKey"] = last_key
+
+
+def _key_prefix(s3_key: str) -> str:
+    """
+    Retourne le "dossier" d'une clé S3 (ex: "reports/a.csv" -> "reports/")
+    
+    Args:
+        s3_key: Clé S3
+    
+    Returns:
+        Préfixe (vide pour une clé à la racine)
+    """
+    return s3_key.rsplit('/', 1)[0] + '/' if '/' in s3_key else ''
 
 
 class S3Service:
@@ -122,11 +394,16 @@ class S3Service:
             region_name: Région AWS (défaut: depuis env ou eu-west-3)
         """
         self.bucket_name = bucket_name
-        self.region_name = region_name or os.getenv("AWS_REGION", "eu-west-3")
+        self.region_name = region_name or _AWS_REGION
+        # Préfixe -> (horodatage, clés listées, listing complet)
+        self._prefix_cache: Dict[str, Tuple[float, Set[str], bool]] = {}
+        # Gestionnaire de transferts créé au premier upload/download
+        self._transfer = None
+        self._transfer_lock = threading.Lock()
         
         if BOTO3_AVAILABLE:
             try:
-                self.s3 = boto3.client("s3", region_name=self.region_name)
+                self.s3 = _s3_client(self.region_name)
             except Exception as e:
                 print(f"⚠ Erreur initialisation S3: {e}")
                 self.s3 = None
@@ -134,6 +411,48 @@ class S3Service:
             self.s3 = None
             print("⚠ Mode simulation S3 (boto3 non disponible)")
     
+    def _get_transfer(self):
+        """
+        Retourne le TransferManager du service (créé au premier usage)
+        
+        Ses threads et leurs connexions HTTPS sont réutilisés d'un transfert
+        à l'autre au lieu d'être recréés à chaque upload/download.
+        
+        Returns:
+            s3transfer TransferManager
+        """
+        if self._transfer is None:
+            with self._transfer_lock:
+                if self._transfer is None:
+                    from boto3.s3.transfer import TransferManager
+                    self._transfer = TransferManager(self.s3, _transfer_config())
+        return self._transfer
+    
+    def close(self):
+        """Arrête le gestionnaire de transferts (threads de travail)"""
+        if self._transfer is not None:
+            self._transfer.shutdown()
+            self._transfer = None
+    
+    def _get_body(self, key: str):
+        """
+        Ouvre le corps d'un objet S3, décompressé s'il est stocké en gzip
+        
+        Les objets envoyés avec ContentEncoding "gzip" (rapports de
+        upload_to_aws.py) gardent leur clé .json/.csv : la décompression
+        est faite ici, en streaming, d'après les métadonnées de l'objet.
+        
+        Args:
+            key: Clé S3 du fichier
+        
+        Returns:
+            Flux binaire (StreamingBody ou GzipFile)
+        """
+        response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
+        if response.get('ContentEncoding') == 'gzip':
+            return gzip.GzipFile(fileobj=response['Body'], mode='rb')
+        return response['Body']
+    
     def read_json_from_s3(self, key: str) -> Optional[Dict]:
         """
         Lit un fichier JSON ou JSONL directement depuis S3
@@ -147,21 +466,100 @@ class S3Service:
         if not self.s3:
             return None
         try:
-            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
-            content = response['Body'].read().decode('utf-8')
+            body = self._get_body(key)
             
-            # Si JSONL (JSON Lines), lire ligne par ligne
+            # Si JSONL (JSON Lines), lire ligne par ligne en streaming
+            # (le contenu complet n'est jamais matérialisé en mémoire)
             if key.endswith('.jsonl'):
-                lines = content.strip().split('\n')
-                data = []
-                for line in lines:
-                    if line.strip():
-                        data.append(json.loads(line))
+                lines = body if isinstance(body, gzip.GzipFile) else body.iter_lines(chunk_size=1 << 20)
+                data = [
+                    _json_loads(line)
+                    for line in lines
+                    if line.strip()
+                ]
                 # Retourner au format attendu
                 return {"data": data} if data else None
             else:
-                # JSON normal
-                return json.loads(content)
+                # JSON normal (bytes parsés directement)
+                return _json_loads(body.read())
+        except Exception as e:
+            print(f"⚠ Erreur lecture S3 {key}: {e}")
+            return None
+    
+    def read_many_json(self, keys: List[str], max_workers: int = 16) -> List[Optional[Dict]]:
+        """
+        Lit plusieurs fichiers JSON/JSONL depuis S3 en parallèle
+        
+        Le client S3 est thread-safe et partagé : les GET concurrents
+        utilisent le même pool de connexions (64 connexions max).
+        
+        Args:
+            keys: Clés S3 des fichiers
+            max_workers: Nombre de lectures simultanées
+        
+        Returns:
+            Données de chaque fichier (None si erreur), dans l'ordre des clés
+        """
+        if not keys:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(keys))) as executor:
+            return list(executor.map(self.read_json_from_s3, keys))
+    
+    def read_json_items_from_s3(self, key: str, item_path: str = "data.item") -> List[Any]:
+        """
+        Lit en streaming les éléments d'un fichier JSON ou JSONL depuis S3
+        
+        Le document complet n'est jamais chargé en mémoire : seuls les éléments
+        correspondant à item_path sont construits. Pour un JSONL, chaque ligne
+        est un élément de "data", item_path doit donc commencer par "data.item".
+        Comme _extract_items, un "data" objet unique (au lieu d'une liste) est
+        accepté : si le premier passage ne trouve rien, l'objet est relu avec
+        le premier ".item" retiré du chemin.
+        
+        Args:
+            key: Clé S3 du fichier
+            item_path: Chemin des éléments (ex: "data.item", "data.item.disruptions.item")
+        
+        Returns:
+            Liste des éléments (vide si erreur)
+        """
+        if not self.s3:
+            return []
+        
+        if not IJSON_AVAILABLE:
+            # Fallback : chargement complet puis extraction
+            data = self.read_json_from_s3(key)
+            return _extract_items(data, item_path) if data else []
+        
+        try:
+            body = self._get_body(key)
+            if key.endswith('.jsonl'):
+                line_path = item_path[len("data.item"):].lstrip('.')
+                return list(ijson.items(body, line_path, multiple_values=True))
+            items = list(ijson.items(body, item_path))
+            if not items and ".item" in item_path:
+                object_path = item_path.replace(".item", "", 1)
+                items = list(ijson.items(self._get_body(key), object_path))
+            return items
+        except Exception as e:
+            print(f"⚠ Erreur lecture S3 {key}: {e}")
+            return []
+    
+    def open_stream(self, key: str):
+        """
+        Ouvre un objet S3 en lecture streaming (sans le télécharger)
+        
+        Args:
+            key: Clé S3 du fichier
+        
+        Returns:
+            Flux binaire (StreamingBody, ou GzipFile si l'objet est compressé) ou None
+        """
+        if not self.s3:
+            return None
+        try:
+            return self._get_body(key)
         except Exception as e:
             print(f"⚠ Erreur lecture S3 {key}: {e}")
             return None
@@ -179,41 +577,55 @@ class S3Service:
         if not self.s3:
             return None
         try:
-            response = self.s3.get_object(Bucket=self.bucket_name, Key=key)
-            content = response['Body'].read().decode('utf-8-sig')
+            content = self._get_body(key).read().decode('utf-8-sig')
             return content
         except Exception as e:
             print(f"⚠ Erreur lecture S3 {key}: {e}")
             return None
     
-    def list_files_in_s3(self, prefix: str, extension: str = None) -> List[str]:
+    def iter_files_in_s3(self, prefix: str,
+                         extension: Union[str, Tuple[str, ...], None] = None) -> Iterator[str]:
+        """
+        Itère sur les fichiers d'un préfixe S3, page par page
+        
+        Toutes les pages de list_objects_v2 sont parcourues (plus de limite
+        à 1000 clés). Les "dossiers" et objets vides (Size 0) sont ignorés.
+        
+        Args:
+            prefix: Préfixe S3 (ex: "cityflow-raw/raw/batch/")
+            extension: Extension(s) optionnelle(s) (ex: ".csv", (".json", ".jsonl"))
+        
+        Yields:
+            Clés S3
+        """
+        if not self.s3:
+            return
+        
+        paginator = self.s3.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket_name,
+            Prefix=prefix,
+            PaginationConfig={'PageSize': 1000}
+        )
+        for page in pages:
+            for obj in page.get('Contents', ()):
+                if obj.get('Size', 0) > 0 and (not extension or obj['Key'].endswith(extension)):
+                    yield obj['Key']
+    
+    def list_files_in_s3(self, prefix: str,
+                         extension: Union[str, Tuple[str, ...], None] = None) -> List[str]:
         """
         Liste les fichiers dans un préfixe S3
         
         Args:
             prefix: Préfixe S3 (ex: "cityflow-raw/raw/batch/")
-            extension: Extension optionnelle (ex: ".csv", ".jsonl")
+            extension: Extension(s) optionnelle(s) (ex: ".csv", (".json", ".jsonl"))
         
         Returns:
             Liste des clés S3
         """
-        if not self.s3:
-            return []
         try:
-            response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
-            if 'Contents' not in response:
-                return []
-            
-            files = [obj['Key'] for obj in response['Contents']]
-            
-            # Filtrer par extension si spécifié
-            if extension:
-                files = [f for f in files if f.endswith(extension)]
-            
-            # Exclure les "dossiers" (clés se terminant par /)
-            files = [f for f in files if not f.endswith('/')]
-            
-            return files
+            return list(self.iter_files_in_s3(prefix, extension))
         except Exception as e:
             print(f"⚠ Erreur listage S3 {prefix}: {e}")
             return []
@@ -239,9 +651,12 @@ class S3Service:
             if content_type:
                 extra_args["ContentType"] = content_type
             
-            self.s3.upload_file(local_path, self.bucket_name, s3_key, ExtraArgs=extra_args)
+            self._get_transfer().upload(
+                local_path, self.bucket_name, s3_key, extra_args=extra_args
+            ).result()
+            self._prefix_cache.pop(_key_prefix(s3_key), None)
             return True
-        except ClientError as e:
+        except _client_error() as e:
             print(f"✗ Erreur S3.upload_file: {e}")
             return False
     
@@ -249,6 +664,9 @@ class S3Service:
         """
         Upload des données bytes vers S3
         
+        Au-delà de MULTIPART_THRESHOLD, l'upload passe en multipart
+        (parts envoyées en parallèle) au lieu d'un put_object unique.
+        
         Args:
             data: Données à uploader (bytes)
             s3_key: Clé S3 (chemin dans le bucket)
@@ -266,9 +684,15 @@ class S3Service:
             if content_type:
                 extra_args["ContentType"] = content_type
             
-            self.s3.put_object(Bucket=self.bucket_name, Key=s3_key, Body=data, **extra_args)
+            if len(data) > MULTIPART_THRESHOLD:
+                self._get_transfer().upload(
+                    BytesIO(data), self.bucket_name, s3_key, extra_args=extra_args
+                ).result()
+            else:
+                self.s3.put_object(Bucket=self.bucket_name, Key=s3_key, Body=data, **extra_args)
+            self._prefix_cache.pop(_key_prefix(s3_key), None)
             return True
-        except ClientError as e:
+        except _client_error() as e:
             print(f"✗ Erreur S3.upload_bytes: {e}")
             return False
     
@@ -276,6 +700,9 @@ class S3Service:
         """
         Télécharge un fichier depuis S3
         
+        Les octets sont copiés tels quels : un objet stocké avec
+        ContentEncoding "gzip" reste compressé (lire via open_stream).
+        
         Args:
             s3_key: Clé S3
             local_path: Chemin local de destination
@@ -288,16 +715,69 @@ class S3Service:
             return False
         
         try:
-            self.s3.download_file(self.bucket_name, s3_key, local_path)
+            self._get_transfer().download(self.bucket_name, s3_key, local_path).result()
             return True
-        except ClientError as e:
+        except _client_error() as e:
             print(f"✗ Erreur S3.download_file: {e}")
             return False
     
+    def download_fileobj(self, s3_key: str, fileobj: BinaryIO) -> bool:
+        """
+        Télécharge un objet S3 dans un fichier ouvert en écriture binaire
+        
+        Le gestionnaire de transfert découpe l'objet en plages
+        (MULTIPART_THRESHOLD) téléchargées en parallèle et écrites au fil de
+        l'eau : l'objet n'est jamais chargé entièrement en mémoire. Les
+        octets sont copiés tels quels (sans décompression gzip).
+        
+        Args:
+            s3_key: Clé S3
+            fileobj: Fichier de destination (ouvert en 'wb')
+        
+        Returns:
+            True si succès
+        """
+        if not self.s3:
+            print(f"[SIMULATION] S3.download_fileobj({self.bucket_name}/{s3_key})")
+            return False
+        
+        try:
+            self._get_transfer().download(self.bucket_name, s3_key, fileobj).result()
+            return True
+        except Exception as e:
+            print(f"✗ Erreur S3.download_fileobj {s3_key}: {e}")
+            return False
+    
+    def get_object_info(self, s3_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne l'identité d'un objet S3 (taille et ETag) sans le télécharger
+        
+        Args:
+            s3_key: Clé S3
+        
+        Returns:
+            Dict {"size", "etag"} ou None si absent/erreur
+        """
+        if not self.s3:
+            return None
+        
+        try:
+            response = self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
+            return {"size": response.get("ContentLength"), "etag": response.get("ETag")}
+        except _client_error() as e:
+            print(f"⚠ Erreur head_object S3 {s3_key}: {e}")
+            return None
+    
     def file_exists(self, s3_key: str) -> bool:
         """
         Vérifie si un fichier existe dans S3
         
+        Répond depuis un listing du préfixe de la clé (un list_objects_v2
+        pour jusqu'à 1000 clés, valable EXISTS_CACHE_TTL secondes) : les
+        vérifications en boucle sur un même préfixe ne coûtent qu'une
+        requête. Repli sur head_object si le préfixe contient plus de
+        1000 clés ou si le listing échoue.
+        
         Args:
             s3_key: Clé S3
         
@@ -307,15 +787,78 @@ class S3Service:
         if not self.s3:
             return False
         
+        prefix = _key_prefix(s3_key)
+        cached = self._prefix_cache.get(prefix)
+        if cached is None or time.monotonic() - cached[0] > EXISTS_CACHE_TTL:
+            try:
+                response = self.s3.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix, MaxKeys=1000)
+                keys = {obj['Key'] for obj in response.get('Contents', ())}
+                cached = (time.monotonic(), keys, not response.get('IsTruncated', False))
+                self._prefix_cache[prefix] = cached
+            except _client_error():
+                cached = None
+        
+        if cached is not None and (s3_key in cached[1] or cached[2]):
+            return s3_key in cached[1]
+        
         try:
             self.s3.head_object(Bucket=self.bucket_name, Key=s3_key)
             return True
-        except ClientError:
+        except _client_error():
             return False
 
 
+@functools.lru_cache(maxsize=32)
+def _get_dynamo(table_name: str, region_name: Optional[str] = None) -> DynamoDBService:
+    """
+    Retourne un DynamoDBService partagé par (table, région)
+    
+    Évite de recréer une ressource boto3 (résolution des credentials,
+    nouvelle connexion TLS) à chaque sauvegarde.
+    
+    Args:
+        table_name: Nom de la table DynamoDB
+        region_name: Région AWS (défaut: depuis env ou eu-west-3)
+    
+    Returns:
+        Service DynamoDB
+    """
+    return DynamoDBService(table_name, region_name)
+
+
+@functools.lru_cache(maxsize=32)
+def _get_s3(bucket_name: str, region_name: Optional[str] = None) -> S3Service:
+    """
+    Retourne un S3Service partagé par (bucket, région)
+    
+    Args:
+        bucket_name: Nom du bucket S3
+        region_name: Région AWS (défaut: depuis env ou eu-west-3)
+    
+    Returns:
+        Service S3
+    """
+    return S3Service(bucket_name, region_name)
+
+
+def _timestamp_and_ttl(ttl_days: int) -> Tuple[str, Optional[int]]:
+    """
+    Horodatage ISO et TTL (epoch) calculés depuis une seule lecture d'horloge
+    
+    Args:
+        ttl_days: Durée de vie en jours (0 = pas de TTL)
+    
+    Returns:
+        Tuple (timestamp ISO, ttl ou None)
+    """
+    now = _time()
+    ttl = int(now) + ttl_days * _DAY_SECS if ttl_days > 0 else None
+    return datetime.fromtimestamp(now).isoformat(), ttl
+
+
 def save_metrics_to_dynamodb(metrics: Dict[str, Any], data_type: str, date: str, 
-                             table_name: Optional[str] = None) -> bool:
+                             table_name: Optional[str] = None,
+                             ttl_days: int = DEFAULT_TTL_DAYS) -> bool:
     """
     Sauvegarde des métriques dans DynamoDB
     
@@ -324,34 +867,78 @@ def save_metrics_to_dynamodb(metrics: Dict[str, Any], data_type: str, date: str,
         data_type: Type de données (bikes, traffic, etc.)
         date: Date au format YYYY-MM-DD
         table_name: Nom de la table (défaut: depuis env)
+        ttl_days: Durée de vie en jours (0 = pas d'attribut ttl)
     
     Returns:
         True si succès
     """
     if not table_name:
-        table_name = os.getenv("DYNAMODB_METRICS_TABLE", f"cityflow-{data_type}-metrics")
+        table_name = _DYNAMO_METRICS_TABLE or f"cityflow-{data_type}-metrics"
     
-    service = DynamoDBService(table_name)
+    service = _get_dynamo(table_name)
+    timestamp, ttl = _timestamp_and_ttl(ttl_days)
     
     # Préparer l'item DynamoDB
     item = {
         "metric_type": data_type,
         "date": date,
-        "timestamp": datetime.now().isoformat(),
-        "metrics": metrics,
-        "ttl": int((datetime.now().timestamp() + (365 * 24 * 3600)))  # TTL 1 an
+        "timestamp": timestamp,
+        "metrics": metrics
     }
+    if ttl is not None:
+        item["ttl"] = ttl
     
     return service.put_item(item)
 
 
-def save_report_to_s3_csv(csv_content: str, date: str, bucket_name: Optional[str] = None,
+def save_metrics_bulk_to_dynamodb(items: List[Tuple[str, str, Dict[str, Any]]],
+                                  table_name: str,
+                                  ttl_days: int = DEFAULT_TTL_DAYS) -> bool:
+    """
+    Sauvegarde plusieurs jeux de métriques dans DynamoDB en écriture groupée
+    
+    La table est obligatoire : les items pouvant mêler plusieurs types, le
+    défaut par type de save_metrics_to_dynamodb/load_metrics_from_dynamodb
+    (cityflow-{data_type}-metrics) ne s'applique pas.
+    
+    Args:
+        items: Liste de tuples (data_type, date, metrics)
+        table_name: Nom de la table
+        ttl_days: Durée de vie en jours (0 = pas d'attribut ttl)
+    
+    Returns:
+        True si succès
+    """
+    if not items:
+        return True
+    
+    service = _get_dynamo(table_name)
+    
+    timestamp, ttl = _timestamp_and_ttl(ttl_days)
+    
+    dynamo_items = [
+        {
+            "metric_type": data_type,
+            "date": date,
+            "timestamp": timestamp,
+            "metrics": metrics
+        }
+        for data_type, date, metrics in items
+    ]
+    if ttl is not None:
+        for item in dynamo_items:
+            item["ttl"] = ttl
+    
+    return service.put_items(dynamo_items)
+
+
+def save_report_to_s3_csv(csv_content: Union[str, bytes], date: str, bucket_name: Optional[str] = None,
                           s3_prefix: Optional[str] = None) -> bool:
     """
     Sauvegarde un rapport CSV dans S3
     
     Args:
-        csv_content: Contenu CSV (string)
+        csv_content: Contenu CSV (bytes UTF-8 envoyés tels quels, ou string)
         date: Date au format YYYY-MM-DD
         bucket_name: Nom du bucket (défaut: depuis env)
         s3_prefix: Préfixe S3 (défaut: depuis env ou "reports/")
@@ -360,20 +947,24 @@ def save_report_to_s3_csv(csv_content: str, date: str, bucket_name: Optional[str
         True si succès
     """
     if not bucket_name:
-        bucket_name = os.getenv("S3_REPORTS_BUCKET", "cityflow-reports")
+        bucket_name = _S3_REPORTS_BUCKET
     
     if not s3_prefix:
-        s3_prefix = os.getenv("S3_REPORTS_PREFIX", "reports")
+        s3_prefix = _S3_REPORTS_PREFIX
     
     s3_key = f"{s3_prefix}/daily_report_{date}.csv"
-    service = S3Service(bucket_name)
+    service = _get_s3(bucket_name)
     
-    csv_bytes = csv_content.encode("utf-8")
+    if isinstance(csv_content, (bytes, bytearray, memoryview)):
+        csv_bytes = bytes(csv_content) if isinstance(csv_content, memoryview) else csv_content
+    else:
+        csv_bytes = csv_content.encode("utf-8")
     return service.upload_bytes(csv_bytes, s3_key, content_type="text/csv")
 
 
 def save_report_to_dynamodb(report: Dict[str, Any], date: str,
-                            table_name: Optional[str] = None) -> bool:
+                            table_name: Optional[str] = None,
+                            ttl_days: int = DEFAULT_TTL_DAYS) -> bool:
     """
     Sauvegarde un rapport dans DynamoDB
     
@@ -381,23 +972,26 @@ def save_report_to_dynamodb(report: Dict[str, Any], date: str,
         report: Rapport à sauvegarder (dict)
         date: Date au format YYYY-MM-DD
         table_name: Nom de la table (défaut: depuis env)
+        ttl_days: Durée de vie en jours (0 = pas d'attribut ttl)
     
     Returns:
         True si succès
     """
     if not table_name:
-        table_name = os.getenv("DYNAMODB_REPORTS_TABLE", "cityflow-daily-reports")
+        table_name = _DYNAMO_REPORTS_TABLE
     
-    service = DynamoDBService(table_name)
+    service = _get_dynamo(table_name)
+    timestamp, ttl = _timestamp_and_ttl(ttl_days)
     
     # Préparer l'item DynamoDB
     item = {
         "report_id": f"daily_report_{date}",
         "date": date,
-        "timestamp": datetime.now().isoformat(),
-        "report": report,
-        "ttl": int((datetime.now().timestamp() + (365 * 24 * 3600)))  # TTL 1 an
+        "timestamp": timestamp,
+        "report": report
     }
+    if ttl is not None:
+        item["ttl"] = ttl
     
     return service.put_item(item)
 
@@ -416,9 +1010,9 @@ def load_metrics_from_dynamodb(data_type: str, date: str,
         Métriques ou None
     """
     if not table_name:
-        table_name = os.getenv("DYNAMODB_METRICS_TABLE", f"cityflow-{data_type}-metrics")
+        table_name = _DYNAMO_METRICS_TABLE or f"cityflow-{data_type}-metrics"
     
-    service = DynamoDBService(table_name)
+    service = _get_dynamo(table_name)
     item = service.get_item({"metric_type": data_type, "date": date})
     
     if item:
@@ -0,0 +1,240 @@
+"""
+Découpe des gros fichiers CSV en shards de taille fixe (~128 MB)
+Permet de répartir le traitement des comptages sur plusieurs processus
+
+Un manifeste ({stem}_manifest.json) est écrit en dernier, une fois tous les
+shards complets : il identifie le fichier source (taille, ETag) et liste
+les shards. Des shards sans manifeste valide ne sont jamais réutilisés.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+# Taille cible d'un shard (alignée sur les blocs Arrow/Ray)
+SHARD_SIZE_BYTES = 128 << 20
+
+
+def get_shard_name(file_path: str, index: int) -> str:
+    """
+    Retourne le nom d'un shard
+
+    Args:
+        file_path: Chemin (ou clé S3) du fichier CSV d'origine
+        index: Numéro du shard
+
+    Returns:
+        Nom du fichier shard (ex: comptages_part_0000.csv)
+    """
+    return f"{Path(file_path).stem}_part_{index:04d}.csv"
+
+
+def get_manifest_name(file_path: str) -> str:
+    """
+    Retourne le nom du manifeste des shards d'un fichier
+
+    Args:
+        file_path: Chemin (ou clé S3) du fichier CSV d'origine
+
+    Returns:
+        Nom du manifeste (ex: comptages_manifest.json)
+    """
+    return f"{Path(file_path).stem}_manifest.json"
+
+
+def build_manifest(source_id: Dict[str, Any], shard_names: List[str]) -> Dict[str, Any]:
+    """
+    Construit le manifeste d'un découpage
+
+    Args:
+        source_id: Identité du fichier source (ex: {"size": ..., "etag": ...})
+        shard_names: Noms des shards, dans l'ordre
+
+    Returns:
+        Manifeste (dict sérialisable en JSON)
+    """
+    return {"source": source_id, "shard_count": len(shard_names), "shards": shard_names}
+
+
+def manifest_matches(manifest: Optional[Dict[str, Any]], source_id: Dict[str, Any]) -> bool:
+    """
+    Vérifie qu'un manifeste correspond au fichier source actuel
+
+    Args:
+        manifest: Manifeste lu (ou None)
+        source_id: Identité actuelle du fichier source
+
+    Returns:
+        True si les shards du manifeste peuvent être réutilisés
+    """
+    return (
+        isinstance(manifest, dict)
+        and manifest.get("source") == source_id
+        and isinstance(manifest.get("shards"), list)
+        and manifest.get("shard_count") == len(manifest["shards"])
+        and len(manifest["shards"]) > 0
+    )
+
+
+def find_existing_shards(file_path: str, output_dir: str,
+                         source_id: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Liste les shards déjà générés pour un fichier, s'ils sont complets
+
+    Les shards ne sont retournés que si le manifeste existe, correspond à
+    source_id (si fourni) et que tous les shards listés sont présents.
+
+    Args:
+        file_path: Chemin (ou clé S3) du fichier CSV d'origine
+        output_dir: Répertoire des shards
+        source_id: Identité actuelle du fichier source
+
+    Returns:
+        Liste ordonnée des chemins des shards (vide si aucun shard réutilisable)
+    """
+    manifest_path = os.path.join(output_dir, get_manifest_name(file_path))
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+
+    if source_id is None and isinstance(manifest, dict):
+        source_id = manifest.get("source")
+    if not manifest_matches(manifest, source_id):
+        return []
+
+    shard_paths = [os.path.join(output_dir, name) for name in manifest["shards"]]
+    if not all(os.path.isfile(path) for path in shard_paths):
+        return []
+    return shard_paths
+
+
+def _remove_stale_shards(file_path: str, output_dir: str) -> None:
+    """
+    Supprime les shards et le manifeste d'un découpage précédent
+
+    Args:
+        file_path: Chemin (ou clé S3) du fichier CSV d'origine
+        output_dir: Répertoire des shards
+    """
+    prefix = f"{Path(file_path).stem}_part_"
+    manifest_name = get_manifest_name(file_path)
+    try:
+        entries = list(os.scandir(output_dir))
+    except OSError:
+        return
+    for entry in entries:
+        if entry.name == manifest_name or (entry.name.startswith(prefix) and entry.name.endswith(".csv")):
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+
+def _iter_lines(stream: BinaryIO, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """
+    Itère sur les lignes (fin de ligne incluse) d'un flux binaire lu par blocs
+
+    Args:
+        stream: Flux binaire (fichier, StreamingBody S3...)
+        chunk_size: Taille des blocs lus
+
+    Yields:
+        Lignes en bytes
+    """
+    pending = b""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        lines = (pending + chunk).split(b"\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + b"\n"
+    if pending:
+        yield pending
+
+
+def shard_stream(stream: BinaryIO,
+                 source_name: str,
+                 output_dir: str,
+                 shard_size: int = SHARD_SIZE_BYTES,
+                 source_id: Optional[Dict[str, Any]] = None) -> List[str]:
+    """
+    Découpe un flux CSV binaire en shards d'environ shard_size octets
+
+    Le flux est consommé au fil de l'eau : le fichier d'origine n'est jamais
+    écrit en entier sur disque ni chargé en mémoire. Chaque shard reprend
+    l'en-tête et se termine sur une fin de ligne. L'opération est idempotente :
+    si des shards complets (manifeste valide pour source_id) existent déjà
+    dans output_dir, ils sont retournés tels quels ; sinon les anciens shards
+    sont supprimés et le fichier est redécoupé. Le manifeste est écrit en
+    dernier.
+
+    Args:
+        stream: Flux binaire du CSV (fichier ouvert en 'rb', body S3...)
+        source_name: Chemin ou clé S3 d'origine (sert à nommer les shards)
+        output_dir: Répertoire de sortie des shards
+        shard_size: Taille cible d'un shard en octets (défaut: 128 MB)
+        source_id: Identité du fichier source (taille, ETag) enregistrée
+            dans le manifeste
+
+    Returns:
+        Liste des chemins des shards créés
+    """
+    existing = find_existing_shards(source_name, output_dir, source_id)
+    if existing:
+        return existing
+
+    os.makedirs(output_dir, exist_ok=True)
+    _remove_stale_shards(source_name, output_dir)
+    shard_paths = []
+    out = None
+
+    try:
+        lines = _iter_lines(stream)
+        header = next(lines, b"")
+        index = 0
+        written = 0
+
+        for line in lines:
+            if out is None:
+                shard_path = os.path.join(output_dir, get_shard_name(source_name, index))
+                out = open(shard_path, 'wb')
+                out.write(header)
+                written = len(header)
+                shard_paths.append(shard_path)
+
+            out.write(line)
+            written += len(line)
+
+            if written >= shard_size:
+                out.close()
+                out = None
+                index += 1
+
+        if out is not None:
+            out.close()
+            out = None
+
+        # Manifeste écrit en dernier : il atteste que les shards sont complets
+        manifest = build_manifest(source_id or {}, [os.path.basename(p) for p in shard_paths])
+        manifest_path = os.path.join(output_dir, get_manifest_name(source_name))
+        with open(manifest_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+
+    except Exception as e:
+        print(f"Erreur découpe shards {source_name}: {e}")
+        if out is not None:
+            out.close()
+        # Ne pas laisser de shards partiels (casserait l'idempotence)
+        for shard_path in shard_paths:
+            try:
+                os.remove(shard_path)
+            except OSError:
+                pass
+        return []
+
+    return shard_paths
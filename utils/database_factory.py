@@ -3,9 +3,24 @@ Factory pour choisir automatiquement le service de base de données
 selon l'environnement (MongoDB local ou Fichiers JSON sur EC2)
 """
 
+import functools
 import os
 from utils.database_service import DatabaseService
 
+# Bucket local présent uniquement en développement (absent sur EC2)
+LOCAL_BUCKET_DIR = "bucket-cityflow-paris-s3-raw"
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_db_type() -> str:
+    """
+    Détecte l'environnement une seule fois par processus
+    
+    Returns:
+        'mongodb' si le bucket local existe, sinon 'local_files'
+    """
+    return "mongodb" if os.path.isdir(LOCAL_BUCKET_DIR) else "local_files"
+
 
 def get_database_service() -> DatabaseService:
     """
@@ -26,14 +41,11 @@ def get_database_service() -> DatabaseService:
     """
     # DÉTECTION AUTOMATIQUE
     # Si pas de bucket local → on est sur EC2 → Fichiers JSON
-    from pathlib import Path
-    local_bucket = Path("bucket-cityflow-paris-s3-raw")
+    db_type = _detect_db_type()
     
-    if not local_bucket.exists():
-        db_type = "local_files"
+    if db_type == "local_files":
         print("🌐 Détection EC2 → utilisation Fichiers JSON locaux")
     else:
-        db_type = "mongodb"
         print("💻 Détection Local → utilisation MongoDB")
     
     # Instancier le service approprié
@@ -79,13 +91,7 @@ def get_database_type() -> str:
     Returns:
         'mongodb' ou 'local_files'
     """
-    from pathlib import Path
-    local_bucket = Path("bucket-cityflow-paris-s3-raw")
-    
-    if not local_bucket.exists():
-        return "local_files"
-    else:
-        return "mongodb"
+    return _detect_db_type()
 
 
 def test_database_connection() -> bool:
@@ -4,7 +4,7 @@ Permet de basculer entre MongoDB (local) et DynamoDB (production)
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 
 class DatabaseService(ABC):
@@ -25,6 +25,24 @@ class DatabaseService(ABC):
         """
         pass
     
+    def save_metrics_bulk(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Sauvegarde plusieurs jeux de métriques en un seul appel
+        
+        Implémentation par défaut : un save_metrics par élément. Les services
+        distants la surchargent pour regrouper les écritures en une requête.
+        
+        Args:
+            items: Liste de tuples (data_type, date, metrics)
+        
+        Returns:
+            Liste des statuts (True si succès), dans l'ordre des items
+        """
+        return [
+            self.save_metrics(metrics=metrics, data_type=data_type, date=date)
+            for data_type, date, metrics in items
+        ]
+    
     @abstractmethod
     def load_metrics(self, data_type: str, date: str) -> Optional[Dict[str, Any]]:
         """
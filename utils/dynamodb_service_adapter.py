@@ -4,11 +4,12 @@ Permet de réutiliser le code existant dans aws_services.py
 """
 
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 from utils.database_service import DatabaseService
 from utils.aws_services import (
     save_metrics_to_dynamodb,
+    save_metrics_bulk_to_dynamodb,
     save_report_to_dynamodb,
     load_metrics_from_dynamodb,
     DynamoDBService
@@ -52,6 +53,19 @@ class DynamoDBServiceAdapter(DatabaseService):
             table_name=self.metrics_table
         )
     
+    def save_metrics_bulk(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Sauvegarde plusieurs jeux de métriques dans DynamoDB (BatchWriteItem)
+        
+        Args:
+            items: Liste de tuples (data_type, date, metrics)
+        
+        Returns:
+            Liste des statuts (True si succès), dans l'ordre des items
+        """
+        success = save_metrics_bulk_to_dynamodb(items, table_name=self.metrics_table)
+        return [success] * len(items)
+    
     def load_metrics(self, data_type: str, date: str) -> Optional[Dict[str, Any]]:
         """
         Charge des métriques depuis DynamoDB
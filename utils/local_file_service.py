@@ -3,14 +3,174 @@ Service pour gérer les métriques et rapports via fichiers JSON locaux
 Utilisé sur EC2 avant chargement manuel vers AWS
 """
 
+import bisect
+import gzip
 import json
 import os
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from datetime import datetime
 
 from utils.database_service import DatabaseService
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Configuration lue une seule fois à l'import
+_OUTPUT_DIR = os.getenv("OUTPUT_DIR", "output")
+_COMPRESS = os.getenv("CITYFLOW_COMPRESS", "0") == "1"
+_METRICS_APPEND = os.getenv("CITYFLOW_METRICS_APPEND", "0") == "1"
+
+# En-tête (magic bytes) d'un fichier gzip
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Taille minimale d'un fichier de métriques exploitable (en-dessous : vide ou tronqué)
+MIN_JSON_FILE_SIZE = 10
+
+
+def _strip_json_ext(name: str) -> Optional[str]:
+    """
+    Retire l'extension .json ou .json.gz d'un nom de fichier
+    
+    Args:
+        name: Nom du fichier
+    
+    Returns:
+        Nom sans extension, ou None si ce n'est pas un fichier JSON
+    """
+    for ext in (".json.gz", ".json"):
+        if name.endswith(ext):
+            return name[:-len(ext)]
+    return None
+
+
+def _existing_path(file_path: Path) -> Optional[Path]:
+    """
+    Retourne le fichier existant parmi la variante .json et .json.gz
+    
+    Args:
+        file_path: Chemin attendu (.json ou .json.gz)
+    
+    Returns:
+        Chemin existant ou None
+    """
+    if file_path.exists():
+        return file_path
+    name = file_path.name
+    other = file_path.with_name(name[:-3] if name.endswith(".gz") else name + ".gz")
+    return other if other.exists() else None
+
+
+def _dump_json(data: Any, file_path: Path, compress: bool = False, indent: bool = False) -> None:
+    """
+    Écrit des données en JSON UTF-8 (compact par défaut) de façon atomique
+    
+    Le JSON est encodé en une fois (orjson si disponible), écrit dans un
+    fichier temporaire puis renommé (os.replace) : un crash ne laisse
+    jamais de fichier JSON partiel.
+    
+    Args:
+        data: Données à sauvegarder
+        file_path: Chemin du fichier
+        compress: Compresser en gzip (niveau 1 : rapide, ~3x plus petit)
+        indent: Indenter sur 2 espaces (lecture humaine)
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        payload = orjson.dumps(data, default=str, option=option)
+    elif indent:
+        payload = json.dumps(data, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+    else:
+        payload = json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8")
+    
+    if compress:
+        payload = gzip.compress(payload, compresslevel=1)
+    
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(payload)
+        while view:
+            view = view[os.write(fd, view):]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, file_path)
+
+
+def _encode_jsonl_line(data: Any) -> bytes:
+    """
+    Encode un enregistrement JSONL (JSON compact + fin de ligne)
+    
+    Args:
+        data: Enregistrement
+    
+    Returns:
+        Ligne en bytes
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str).encode("utf-8") + b"\n"
+
+
+def _read_monthly(file_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Lit un fichier JSONL mensuel et garde le dernier enregistrement par date
+    
+    Une ligne illisible (ex: écriture interrompue) est ignorée.
+    
+    Args:
+        file_path: Chemin du fichier {data_type}_metrics_{YYYY-MM}.jsonl
+    
+    Returns:
+        Dict date -> dernier enregistrement de cette date
+    """
+    loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+    records = {}
+    with open(file_path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = loads(line)
+            except ValueError:
+                continue
+            records[record.get("date")] = record
+    return records
+
+
+def _load_json(file_path: Path) -> Any:
+    """
+    Charge un fichier JSON, compressé en gzip ou non (orjson si disponible)
+    
+    La compression est détectée sur les magic bytes, pas sur l'extension.
+    
+    Args:
+        file_path: Chemin du fichier
+    
+    Returns:
+        Données JSON
+    """
+    with open(file_path, 'rb') as f:
+        payload = f.read()
+    
+    if payload[:2] == GZIP_MAGIC:
+        payload = gzip.decompress(payload)
+    
+    if ORJSON_AVAILABLE:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
 
 class LocalFileService(DatabaseService):
     """Service pour stocker métriques et rapports dans des fichiers JSON locaux"""
@@ -26,7 +186,7 @@ class LocalFileService(DatabaseService):
         if base_dir:
             self.base_dir = Path(base_dir)
         else:
-            output_dir = os.getenv("OUTPUT_DIR", "output")
+            output_dir = _OUTPUT_DIR
             self.base_dir = Path(output_dir)
             
             # Si le chemin n'existe pas et n'est pas relatif, utiliser "output" local
@@ -36,6 +196,14 @@ class LocalFileService(DatabaseService):
         
         self.metrics_dir = self.base_dir / "metrics"
         self.reports_dir = self.base_dir / "reports"
+        self.pretty_dir = self.base_dir / "pretty"
+        
+        # Compression gzip des fichiers écrits (opt-in, lecture transparente)
+        self.compress = _COMPRESS
+        self._ext = ".json.gz" if self.compress else ".json"
+        
+        # Métriques écrites dans le JSONL mensuel au lieu du fichier journalier (opt-in)
+        self.append_metrics = _METRICS_APPEND
         
         # Créer les répertoires s'ils n'existent pas
         try:
@@ -50,22 +218,128 @@ class LocalFileService(DatabaseService):
             self.metrics_dir.mkdir(parents=True, exist_ok=True)
             self.reports_dir.mkdir(parents=True, exist_ok=True)
         
+        # Index des dates disponibles par type (évite de parcourir metrics/)
+        self._index_path = self.metrics_dir / "_index.json"
+        self._index_lock = threading.Lock()
+        self._index = self._load_index()
+        
         print("✓ Service fichiers locaux initialisé")
         print(f"  📁 Métriques: {self.metrics_dir}")
         print(f"  📁 Rapports: {self.reports_dir}")
     
     def _get_metrics_path(self, data_type: str, date: str) -> Path:
         """Retourne le chemin du fichier de métriques"""
-        return self.metrics_dir / f"{data_type}_metrics_{date}.json"
+        return self.metrics_dir / f"{data_type}_metrics_{date}{self._ext}"
+    
+    def _get_monthly_path(self, data_type: str, date: str) -> Path:
+        """Retourne le chemin du fichier JSONL mensuel (écritures en append)"""
+        return self.metrics_dir / f"{data_type}_metrics_{date[:7]}.jsonl"
     
     def _get_report_path(self, date: str) -> Path:
         """Retourne le chemin du fichier de rapport"""
-        return self.reports_dir / f"daily_report_{date}.json"
+        return self.reports_dir / f"daily_report_{date}{self._ext}"
+    
+    def _load_index(self) -> Dict[str, List[str]]:
+        """
+        Charge l'index des dates (le reconstruit depuis metrics/ s'il est absent)
+        
+        Returns:
+            Dict data_type -> liste triée des dates
+        """
+        try:
+            return _load_json(self._index_path)
+        except (OSError, ValueError):
+            pass
+        
+        return self._build_index()
+    
+    def _build_index(self) -> Dict[str, List[str]]:
+        """
+        Construit l'index des dates depuis les fichiers de metrics/ et le réécrit
+        
+        Returns:
+            Dict data_type -> liste triée des dates
+        """
+        index = {}
+        for file_path in self.metrics_dir.glob("*_metrics_*.json*"):
+            stem = _strip_json_ext(file_path.name)
+            if stem:
+                data_type, _, date = stem.rpartition("_metrics_")
+                index.setdefault(data_type, set()).add(date)
+            elif self._is_monthly_file(file_path.name):
+                data_type = file_path.name.rpartition("_metrics_")[0]
+                try:
+                    dates = (date for date in _read_monthly(file_path) if date)
+                    index.setdefault(data_type, set()).update(dates)
+                except OSError as e:
+                    print(f"  ⚠ Fichier JSONL ignoré {file_path.name}: {e}")
+        index = {data_type: sorted(dates) for data_type, dates in index.items()}
+        
+        try:
+            self._write_index(index)
+        except OSError as e:
+            print(f"  ⚠ Erreur écriture index métriques: {e}")
+        return index
+    
+    def rebuild_index(self):
+        """
+        Reconstruit l'index des dates depuis metrics/
+        
+        L'index est tenu à jour par les sauvegardes de ce service ; à appeler
+        après des ajouts ou suppressions de fichiers faits hors de ce service
+        (autre processus, copie manuelle).
+        """
+        with self._index_lock:
+            self._index = self._build_index()
+    
+    @staticmethod
+    def _is_monthly_file(name: str) -> bool:
+        """
+        Indique si un nom de fichier est un JSONL mensuel ({data_type}_metrics_{YYYY-MM}.jsonl)
+        
+        Args:
+            name: Nom du fichier
+        
+        Returns:
+            True si fichier mensuel
+        """
+        if not name.endswith(".jsonl"):
+            return False
+        month = name[:-len(".jsonl")].rpartition("_metrics_")[2]
+        return len(month) == 7 and month[4] == "-"
+    
+    def _write_index(self, index: Dict[str, List[str]]):
+        """
+        Réécrit l'index des dates (écriture atomique)
+        
+        Args:
+            index: Dict data_type -> liste triée des dates
+        """
+        _dump_json(index, self._index_path)
+    
+    def _add_to_index(self, data_type: str, date: str):
+        """
+        Ajoute une date à l'index (no-op si déjà présente)
+        
+        Args:
+            data_type: Type de données
+            date: Date au format YYYY-MM-DD
+        """
+        with self._index_lock:
+            dates = self._index.setdefault(data_type, [])
+            pos = bisect.bisect_left(dates, date)
+            if pos < len(dates) and dates[pos] == date:
+                return
+            dates.insert(pos, date)
+            self._write_index(self._index)
     
     def save_metrics(self, metrics: Dict[str, Any], data_type: str, date: str) -> bool:
         """
         Sauvegarde des métriques dans un fichier JSON local
         
+        Avec CITYFLOW_METRICS_APPEND=1, les métriques sont ajoutées au
+        JSONL mensuel (save_metrics_append) au lieu du fichier journalier.
+        
         Args:
             metrics: Métriques à sauvegarder
             data_type: Type de données (bikes, traffic, weather, etc.)
@@ -74,6 +348,9 @@ class LocalFileService(DatabaseService):
         Returns:
             True si succès
         """
+        if self.append_metrics:
+            return self.save_metrics_append(metrics, data_type, date)
+        
         try:
             file_path = self._get_metrics_path(data_type, date)
             
@@ -86,8 +363,8 @@ class LocalFileService(DatabaseService):
             }
             
             # Sauvegarder
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            _dump_json(data, file_path, self.compress)
+            self._add_to_index(data_type, date)
             
             print(f"  ✓ Métriques {data_type} sauvegardées: {file_path}")
             return True
@@ -96,10 +373,53 @@ class LocalFileService(DatabaseService):
             print(f"✗ Erreur sauvegarde métriques {data_type}: {e}")
             return False
     
+    def save_metrics_append(self, metrics: Dict[str, Any], data_type: str, date: str) -> bool:
+        """
+        Ajoute des métriques au fichier JSONL mensuel du type (append-only)
+        
+        Pour les mises à jour répétées d'une même journée : une seule ligne
+        est écrite (O_APPEND) au lieu de réécrire le fichier journalier.
+        Le dernier enregistrement d'une date prime lors de la lecture ; face
+        au fichier journalier, l'écriture la plus récente (timestamp) prime.
+        
+        Args:
+            metrics: Métriques à sauvegarder
+            data_type: Type de données (bikes, traffic, weather, etc.)
+            date: Date au format YYYY-MM-DD
+        
+        Returns:
+            True si succès
+        """
+        try:
+            file_path = self._get_monthly_path(data_type, date)
+            line = _encode_jsonl_line({
+                "date": date,
+                "timestamp": datetime.now().isoformat(),
+                "metrics": metrics
+            })
+            
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._add_to_index(data_type, date)
+            
+            print(f"  ✓ Métriques {data_type} ajoutées: {file_path}")
+            return True
+            
+        except Exception as e:
+            print(f"✗ Erreur ajout métriques {data_type}: {e}")
+            return False
+    
     def load_metrics(self, data_type: str, date: str) -> Optional[Dict[str, Any]]:
         """
         Charge des métriques depuis un fichier JSON local
         
+        Le JSONL mensuel (save_metrics_append) et le fichier journalier
+        peuvent coexister : l'enregistrement au timestamp le plus récent
+        est retourné.
+        
         Args:
             data_type: Type de données
             date: Date au format YYYY-MM-DD
@@ -108,16 +428,27 @@ class LocalFileService(DatabaseService):
             Métriques ou None si non trouvées
         """
         try:
-            file_path = self._get_metrics_path(data_type, date)
+            candidates = []
+            
+            monthly_path = self._get_monthly_path(data_type, date)
+            if monthly_path.exists():
+                record = _read_monthly(monthly_path).get(date)
+                if record is not None:
+                    candidates.append((record.get("timestamp", ""), monthly_path.name, record))
             
-            if not file_path.exists():
-                print(f"  ⚠ Fichier métriques non trouvé: {file_path}")
+            expected_path = self._get_metrics_path(data_type, date)
+            file_path = _existing_path(expected_path)
+            if file_path is not None:
+                data = _load_json(file_path)
+                candidates.append((data.get("timestamp", ""), file_path.name, data))
+            
+            if not candidates:
+                print(f"  ⚠ Fichier métriques non trouvé: {expected_path}")
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            _, name, data = max(candidates, key=lambda candidate: candidate[0])
             
-            print(f"  ✓ Métriques {data_type} chargées depuis: {file_path.name}")
+            print(f"  ✓ Métriques {data_type} chargées depuis: {name}")
             return data.get("metrics")
             
         except Exception as e:
@@ -147,8 +478,7 @@ class LocalFileService(DatabaseService):
             }
             
             # Sauvegarder
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            _dump_json(data, file_path, self.compress)
             
             print(f"  ✓ Rapport sauvegardé: {file_path}")
             return True
@@ -168,14 +498,14 @@ class LocalFileService(DatabaseService):
             Rapport ou None si non trouvé
         """
         try:
-            file_path = self._get_report_path(date)
+            expected_path = self._get_report_path(date)
+            file_path = _existing_path(expected_path)
             
-            if not file_path.exists():
-                print(f"  ⚠ Fichier rapport non trouvé: {file_path}")
+            if file_path is None:
+                print(f"  ⚠ Fichier rapport non trouvé: {expected_path}")
                 return None
             
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _load_json(file_path)
             
             print(f"  ✓ Rapport chargé depuis: {file_path.name}")
             return data.get("report")
@@ -199,27 +529,60 @@ class LocalFileService(DatabaseService):
         results = []
         
         try:
-            # Lister tous les fichiers de métriques pour ce type
-            pattern = f"{data_type}_metrics_*.json"
-            for file_path in self.metrics_dir.glob(pattern):
-                # Extraire la date du nom de fichier
-                filename = file_path.stem
-                # Format: {data_type}_metrics_{date}
-                parts = filename.split('_')
-                if len(parts) >= 3:
-                    file_date = parts[-1]  # Dernière partie = date
-                    
-                    # Vérifier si dans la plage
-                    if start_date <= file_date <= end_date:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            results.append({
-                                "date": data.get("date", file_date),
-                                "metrics": data.get("metrics")
-                            })
+            # Fichiers triés par nom, donc par date (format: {data_type}_metrics_{date})
+            prefix = f"{data_type}_metrics_"
+            entries = []
+            monthly_paths = []
+            with os.scandir(self.metrics_dir) as it:
+                for entry in it:
+                    if not entry.name.startswith(prefix):
+                        continue
+                    if _strip_json_ext(entry.name):
+                        entries.append(entry)
+                    elif (self._is_monthly_file(entry.name)
+                          and start_date[:7] <= entry.name[len(prefix):len(prefix) + 7] <= end_date[:7]):
+                        monthly_paths.append(Path(entry.path))
+            entries.sort(key=lambda entry: entry.name)
             
-            # Trier par date
-            results.sort(key=lambda x: x.get("date", ""))
+            last_date = None
+            timestamps = {}
+            for entry in entries:
+                file_date = _strip_json_ext(entry.name)[len(prefix):]
+                
+                # Seuls les fichiers dans la plage sont ouverts
+                # (une seule variante .json/.json.gz par date)
+                if file_date < start_date or file_date == last_date:
+                    continue
+                if file_date > end_date:
+                    break
+                
+                # Ignorer les fichiers vides/tronqués ou illisibles sans les parser
+                try:
+                    if entry.stat().st_size < MIN_JSON_FILE_SIZE:
+                        continue
+                    data = _load_json(Path(entry.path))
+                except (OSError, EOFError, ValueError) as e:
+                    print(f"  ⚠ Fichier métriques ignoré {entry.name}: {e}")
+                    continue
+                
+                last_date = file_date
+                timestamps[file_date] = data.get("timestamp", "")
+                results.append({
+                    "date": data.get("date", file_date),
+                    "metrics": data.get("metrics")
+                })
+            
+            # JSONL mensuels : un fichier lu par mois, dernier enregistrement par date,
+            # retenu s'il est plus récent que le fichier journalier de la même date
+            if monthly_paths:
+                by_date = {result["date"]: result for result in results}
+                for file_path in monthly_paths:
+                    for date, record in _read_monthly(file_path).items():
+                        if not date or not start_date <= date <= end_date:
+                            continue
+                        if record.get("timestamp", "") >= timestamps.get(date, ""):
+                            by_date[date] = {"date": date, "metrics": record.get("metrics")}
+                results = [by_date[date] for date in sorted(by_date)]
             
             print(f"  ✓ {len(results)} fichier(s) de métriques {data_type} trouvé(s) pour {start_date} à {end_date}")
             return results
@@ -232,29 +595,17 @@ class LocalFileService(DatabaseService):
         """
         Liste toutes les dates disponibles pour un type de données
         
+        Lecture directe de l'index (metrics/_index.json), sans parcourir
+        le répertoire. Après des modifications faites hors de ce service,
+        appeler rebuild_index().
+        
         Args:
             data_type: Type de données
         
         Returns:
             Liste des dates (YYYY-MM-DD)
         """
-        dates = []
-        
-        try:
-            pattern = f"{data_type}_metrics_*.json"
-            for file_path in self.metrics_dir.glob(pattern):
-                filename = file_path.stem
-                parts = filename.split('_')
-                if len(parts) >= 3:
-                    date = parts[-1]
-                    dates.append(date)
-            
-            dates.sort()
-            return dates
-            
-        except Exception as e:
-            print(f"✗ Erreur listage dates {data_type}: {e}")
-            return []
+        return list(self._index.get(data_type, []))
     
     def get_latest_metrics(self, data_type: str) -> Optional[Dict[str, Any]]:
         """
@@ -273,6 +624,45 @@ class LocalFileService(DatabaseService):
         latest_date = dates[-1]
         return self.load_metrics(data_type, latest_date)
     
+    def pretty_print(self, date: str) -> List[Path]:
+        """
+        Écrit une copie indentée (lisible) des fichiers d'une date
+        
+        Les fichiers de métriques et de rapport sont stockés en JSON compact ;
+        cette méthode les recopie à la demande dans pretty/ sous la forme
+        {nom}.pretty.json.
+        
+        Args:
+            date: Date au format YYYY-MM-DD
+        
+        Returns:
+            Liste des fichiers écrits
+        """
+        sources = [
+            self._get_metrics_path(data_type, date)
+            for data_type, dates in self._index.items()
+            if date in dates
+        ]
+        sources.append(self._get_report_path(date))
+        
+        written = []
+        try:
+            self.pretty_dir.mkdir(parents=True, exist_ok=True)
+            for expected_path in sources:
+                file_path = _existing_path(expected_path)
+                if file_path is None:
+                    continue
+                pretty_path = self.pretty_dir / f"{_strip_json_ext(file_path.name)}.pretty.json"
+                _dump_json(_load_json(file_path), pretty_path, indent=True)
+                written.append(pretty_path)
+            
+            print(f"  ✓ {len(written)} fichier(s) lisible(s) écrit(s) dans {self.pretty_dir}")
+            return written
+            
+        except Exception as e:
+            print(f"✗ Erreur pretty-print {date}: {e}")
+            return written
+    
     def close(self):
         """Ferme la connexion (pas nécessaire pour fichiers locaux)"""
         pass
@@ -4,12 +4,12 @@ Permet de stocker métriques et rapports dans MongoDB Compass
 """
 
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 
 try:
-    from pymongo import MongoClient
-    from pymongo.errors import ConnectionFailure, OperationFailure
+    from pymongo import MongoClient, UpdateOne
+    from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure
     PYMONGO_AVAILABLE = True
 except ImportError:
     PYMONGO_AVAILABLE = False
@@ -68,13 +68,14 @@ class MongoDBService(DatabaseService):
             True si succès
         """
         try:
+            now = datetime.now()
             document = {
                 "metric_type": data_type,
                 "date": date,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "metrics": metrics,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
+                "created_at": now,
+                "updated_at": now
             }
             
             # Upsert: remplace si existe déjà (même metric_type + date)
@@ -97,6 +98,48 @@ class MongoDBService(DatabaseService):
             print(f"✗ Erreur MongoDB save_metrics: {e}")
             return False
     
+    def save_metrics_bulk(self, items: List[Tuple[str, str, Dict[str, Any]]]) -> List[bool]:
+        """
+        Sauvegarde plusieurs jeux de métriques via un seul bulk_write (non ordonné)
+        
+        Args:
+            items: Liste de tuples (data_type, date, metrics)
+        
+        Returns:
+            Liste des statuts (True si succès), dans l'ordre des items
+        """
+        if not items:
+            return []
+        
+        now = datetime.now()
+        operations = [
+            UpdateOne(
+                {"metric_type": data_type, "date": date},
+                {"$set": {
+                    "metric_type": data_type,
+                    "date": date,
+                    "timestamp": now.isoformat(),
+                    "metrics": metrics,
+                    "created_at": now,
+                    "updated_at": now
+                }},
+                upsert=True
+            )
+            for data_type, date, metrics in items
+        ]
+        
+        try:
+            result = self.metrics_collection.bulk_write(operations, ordered=False)
+            print(f"  ✓ {result.upserted_count} métriques insérées, {result.modified_count} mises à jour (bulk)")
+            return [True] * len(items)
+        except BulkWriteError as e:
+            failed = {err["index"] for err in e.details.get("writeErrors", [])}
+            print(f"✗ Erreur MongoDB save_metrics_bulk: {len(failed)} écriture(s) en échec")
+            return [i not in failed for i in range(len(items))]
+        except Exception as e:
+            print(f"✗ Erreur MongoDB save_metrics_bulk: {e}")
+            return [False] * len(items)
+    
     def load_metrics(self, data_type: str, date: str) -> Optional[Dict[str, Any]]:
         """
         Charge des métriques depuis MongoDB
@@ -133,13 +176,14 @@ class MongoDBService(DatabaseService):
             True si succès
         """
         try:
+            now = datetime.now()
             document = {
                 "report_id": f"daily_report_{date}",
                 "date": date,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "report": report,
-                "created_at": datetime.now(),
-                "updated_at": datetime.now()
+                "created_at": now,
+                "updated_at": now
             }
             
             # Upsert: remplace si existe déjà (même date)